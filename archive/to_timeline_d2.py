@@ -1,126 +1,175 @@
 import os
 import argparse
+import io
+import shutil
 import subprocess
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 from usdm4.api.scheduled_instance import (
     ScheduledActivityInstance,
     ScheduledDecisionInstance,
     ScheduledInstance,
 )
-from usdm4.api.wrapper import Wrapper
-from usdm4.api.study_design import StudyDesign
 from usdm4.api.schedule_timeline_exit import ScheduleTimelineExit
 from usdm4 import USDM4
 from usdm4.builder.builder import Builder
 from simple_error_log.errors import Errors
 
+_ACTIVITY_INSTANCE = ScheduledActivityInstance.__name__
+
+# Resolved once at import, no 'which' process per render
+_D2_PATH = shutil.which("d2")
+
+_ESCAPE_TABLE = str.maketrans({'"': '\\"'})
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*'})
+
+# D2 node blocks, each ends with a blank separator line
+_HEADER_TMPL = "# USDM Timeline Visualization\n# Timeline: {label}\n# Condition: {condition}\ndirection: right\n\n"
+_ENTRY_TMPL = """{id}: "{label}" {{
+  shape: oval
+  width: 150
+  height: 60
+  style: {{
+    fill: "#90EE90"
+    stroke: "#006400"
+    stroke-width: 2
+  }}
+}}
+
+"""
+_ACTIVITY_TMPL = """{id}: "ScheduledActivityInstance" {{
+  shape: rectangle
+  style: {{
+    fill: "#ADD8E6"
+    stroke: "#4169E1"
+  }}
+}}
+
+"""
+_DECISION_TMPL = """{id}: "ScheduledDecisionInstance" {{
+  shape: diamond
+  style: {{
+    fill: "#FFD700"
+    stroke: "#FF8C00"
+  }}
+}}
+
+"""
+_EXIT_TMPL = """{id}: "Exit" {{
+  shape: oval
+  width: 100
+  height: 60
+  style: {{
+    fill: "#FFB6C1"
+    stroke: "#DC143C"
+    stroke-width: 2
+  }}
+}}
+
+"""
+_TIMING_TMPL = """{id}: "{label}" {{
+  shape: circle
+  style: {{
+    fill: "#DDA0DD"
+    stroke: "#8B008B"
+  }}
+}}
+
+"""
+
+
+_USDM_SINGLETON = None
+
+
+def _get_usdm() -> USDM4:
+    # Shared across Timeline instances so USDM4 is only set up once per process
+    global _USDM_SINGLETON
+    if _USDM_SINGLETON is None:
+        _USDM_SINGLETON = USDM4()
+    return _USDM_SINGLETON
+
 
 class Timeline:
     def __init__(self, file_path: str, errors: Errors):
         self._errors = errors
-        self._usdm = USDM4()
+        self._usdm = _get_usdm()
         self._file_path = file_path
         self._builder: Builder = self._usdm.builder(errors)
+        self._wrapper = None
 
     def get_timelines(self):
         """Get all timelines from USDM data."""
-        self._builder.seed(self._file_path)
-        wrapper_dict: dict = self._builder._data_store.data
-        wrapper_dict["study"]["id"] = uuid4()
-        wrapper = Wrapper.model_validate(wrapper_dict)
+        wrapper = self._ensure_loaded()
         try:
-            study_design = wrapper.study.versions[0].studyDesigns[0]
-            return study_design.scheduleTimelines
+            study_design = wrapper["study"]["versions"][0]["studyDesigns"][0]
+            return study_design["scheduleTimelines"]
         except Exception as e:
             self._errors.exception(f"Failed accessing timelines", e)
             return []
 
+    def _ensure_loaded(self) -> dict:
+        # Seed once, later calls reuse the same data. The traversal is read
+        # only over the builder's dicts so no Pydantic Wrapper is validated.
+        if self._wrapper is None:
+            self._builder.seed(self._file_path)
+            # DataStore keeps instances in an id-keyed dict, bind its lookup once
+            self._xref = self._builder._data_store.instance_by_id
+            self._wrapper = self._builder._data_store.data
+        return self._wrapper
+
     def generate_timeline_d2(self, timeline):
         """Generate D2 syntax for a single timeline."""
-        d2_lines = []
-        d2_lines.append("# USDM Timeline Visualization")
-        d2_lines.append(f"# Timeline: {timeline.label}")
-        d2_lines.append(f"# Condition: {timeline.entryCondition}")
-        d2_lines.append("direction: right")
-        d2_lines.append("")
+        # Blocks are written straight into one buffer, each ends with its blank line
+        buf = io.StringIO()
+        w = buf.write
+        w(_HEADER_TMPL.format(label=timeline.get("label"), condition=timeline["entryCondition"]))
 
         try:
-            timings = timeline.timings
+            timings = timeline.get("timings", [])
 
             # First, collect all instances in sequence
             instances = []
-            instance = self._get_cross_reference(timeline.entryId)
+            instance = self._get_cross_reference(timeline["entryId"])
             while instance:
                 instances.append(instance)
                 instance = self._get_cross_reference(instance.get("defaultConditionId"))
 
             # Separate activity and decision instances
-            activity_instances = [
-                inst
-                for inst in instances
-                if inst["instanceType"] == ScheduledActivityInstance.__name__
-            ]
-            decision_instances = [
-                inst
-                for inst in instances
-                if inst["instanceType"] != ScheduledActivityInstance.__name__
-            ]
+            activity_instances = []
+            decision_instances = []
+            for inst in instances:
+                if inst["instanceType"] == _ACTIVITY_INSTANCE:
+                    activity_instances.append(inst)
+                else:
+                    decision_instances.append(inst)
 
             # Timeline entry node (pill/capsule shape)
-            d2_lines.append(f'{timeline.id}: "{timeline.label}" {{')
-            d2_lines.append("  shape: oval")
-            d2_lines.append("  width: 150")
-            d2_lines.append("  height: 60")
-            d2_lines.append("  style: {")
-            d2_lines.append('    fill: "#90EE90"')
-            d2_lines.append('    stroke: "#006400"')
-            d2_lines.append("    stroke-width: 2")
-            d2_lines.append("  }")
-            d2_lines.append("}")
-            d2_lines.append("")
+            w(_ENTRY_TMPL.format(id=timeline["id"], label=timeline.get("label")))
 
             # Add all activity instances at root level
             for inst in activity_instances:
-                d2_lines.append(f'{inst["id"]}: "ScheduledActivityInstance" {{')
-                d2_lines.append("  shape: rectangle")
-                d2_lines.append("  style: {")
-                d2_lines.append('    fill: "#ADD8E6"')
-                d2_lines.append('    stroke: "#4169E1"')
-                d2_lines.append("  }")
-                d2_lines.append("}")
-                d2_lines.append("")
+                w(_ACTIVITY_TMPL.format(id=inst["id"]))
 
             # Connect timeline entry to first activity instance
             if activity_instances:
-                d2_lines.append(
-                    f"{timeline.id} -> {activity_instances[0]['id']}: first"
+                w(
+                    f"{timeline['id']} -> {activity_instances[0]['id']}: first\n\n"
                 )
-                d2_lines.append("")
 
             # Add connections between activity instances
             for i in range(len(activity_instances) - 1):
-                d2_lines.append(
-                    f"{activity_instances[i]['id']} -> {activity_instances[i + 1]['id']}"
+                w(
+                    f"{activity_instances[i]['id']} -> {activity_instances[i + 1]['id']}\n\n"
                 )
-                d2_lines.append("")
 
             # Add decision instances
             for inst in decision_instances:
-                d2_lines.append(f'{inst["id"]}: "ScheduledDecisionInstance" {{')
-                d2_lines.append("  shape: diamond")
-                d2_lines.append("  style: {")
-                d2_lines.append('    fill: "#FFD700"')
-                d2_lines.append('    stroke: "#FF8C00"')
-                d2_lines.append("  }")
-                d2_lines.append("}")
-                d2_lines.append("")
+                w(_DECISION_TMPL.format(id=inst["id"]))
 
                 # Add condition branches for decision instances
                 for condition in inst.get("conditionAssignments", []):
-                    condition_text = condition["condition"].replace('"', '\\"')
+                    condition_text = condition["condition"].translate(_ESCAPE_TABLE)
                     target_id = condition["conditionTargetId"]
-                    d2_lines.append(f'{inst["id"]} -> {target_id}: "{condition_text}"')
-                    d2_lines.append("")
+                    w(f'{inst["id"]} -> {target_id}: "{condition_text}"\n\n')
 
             # Add exit node
             if instances:
@@ -129,54 +178,34 @@ class Timeline:
                     last_instance.get("timelineExitId")
                 )
                 if exit_obj:
-                    d2_lines.append(f'{exit_obj["id"]}: "Exit" {{')
-                    d2_lines.append("  shape: oval")
-                    d2_lines.append("  width: 100")
-                    d2_lines.append("  height: 60")
-                    d2_lines.append("  style: {")
-                    d2_lines.append('    fill: "#FFB6C1"')
-                    d2_lines.append('    stroke: "#DC143C"')
-                    d2_lines.append("    stroke-width: 2")
-                    d2_lines.append("  }")
-                    d2_lines.append("}")
-                    d2_lines.append("")
+                    w(_EXIT_TMPL.format(id=exit_obj["id"]))
 
                     # Connect last activity instance to exit
                     if activity_instances:
-                        d2_lines.append(
-                            f"{activity_instances[-1]['id']} -> {exit_obj['id']}: exit"
+                        w(
+                            f"{activity_instances[-1]['id']} -> {exit_obj['id']}: exit\n\n"
                         )
-                        d2_lines.append("")
 
             # Add timing nodes
             for timing in timings:
-                timing_label = f"{timing.label}\\n{timing.type.decode}\\n{timing.value}\\n{timing.windowLower}..{timing.windowUpper}"
-                timing_label = timing_label.replace('"', '\\"')
-                d2_lines.append(f'{timing.id}: "{timing_label}" {{')
-                d2_lines.append("  shape: circle")
-                d2_lines.append("  style: {")
-                d2_lines.append('    fill: "#DDA0DD"')
-                d2_lines.append('    stroke: "#8B008B"')
-                d2_lines.append("  }")
-                d2_lines.append("}")
-                d2_lines.append("")
-
-                from_id = timing.relativeFromScheduledInstanceId
-                to_id = timing.relativeToScheduledInstanceId
-
-                d2_lines.append(f"{from_id} -> {timing.id}: from")
-                d2_lines.append(f"{timing.id} -> {to_id}: to")
-                d2_lines.append("")
-
-            return "\n".join(d2_lines)
+                timing_label = f"{timing.get('label')}\\n{timing['type']['decode']}\\n{timing['value']}\\n{timing.get('windowLower')}..{timing.get('windowUpper')}"
+                timing_label = timing_label.translate(_ESCAPE_TABLE)
+                w(_TIMING_TMPL.format(id=timing["id"], label=timing_label))
+
+                from_id = timing["relativeFromScheduledInstanceId"]
+                to_id = timing.get("relativeToScheduledInstanceId")
+
+                w(f"{from_id} -> {timing['id']}: from\n{timing['id']} -> {to_id}: to\n\n")
+
+            return buf.getvalue()
         except Exception as e:
             self._errors.exception(
-                f"Failed generating D2 for timeline {timeline.label}", e
+                f"Failed generating D2 for timeline {timeline.get('label')}", e
             )
             return ""
 
     def _get_cross_reference(self, id):
-        return self._builder._data_store.instance_by_id(id)
+        return self._xref(id)
 
 
 def save_d2(file_path, content):
@@ -185,35 +214,49 @@ def save_d2(file_path, content):
         f.write(content)
 
 
+def d2_installed():
+    """Check whether the d2 command is available."""
+    if _D2_PATH is None:
+        print("\nWarning: D2 is not installed.")
+        print("To install D2, visit: https://d2lang.com/tour/install")
+        print("Or use: brew install d2 (on macOS)")
+        return False
+    return True
+
+
 def render_d2_to_svg(d2_file, svg_file):
     """Render D2 file to SVG using the d2 command."""
     try:
-        # Check if d2 is installed
-        result = subprocess.run(["which", "d2"], capture_output=True, text=True)
-        if result.returncode != 0:
-            print("\nWarning: D2 is not installed.")
-            print("To install D2, visit: https://d2lang.com/tour/install")
-            print("Or use: brew install d2 (on macOS)")
-            print(f"\nD2 source file has been created: {d2_file}")
-            return False
-
-        # Render the diagram
-        print(f"Rendering D2 diagram to {svg_file}...")
-        subprocess.run(["d2", d2_file, svg_file], check=True)
-        print(f"Successfully created: {svg_file}")
+        # d2's progress output is discarded, stderr is kept for the error report
+        subprocess.run(
+            [_D2_PATH, d2_file, svg_file],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
         return True
 
     except subprocess.CalledProcessError as e:
-        print(f"Error rendering D2 diagram: {e}")
+        # One print per failure so reports from concurrent renders stay whole
+        detail = f"\n{e.stderr.strip()}" if e.stderr else ""
+        print(f"Error rendering D2 diagram: {e}{detail}")
         return False
 
 
+def render_all(jobs):
+    """
+    Render (d2_file, svg_file) pairs concurrently.
+    Each render is an independent d2 process so threads are enough to overlap them.
+    """
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(lambda job: render_d2_to_svg(*job), jobs))
+
+
 def sanitize_filename(name):
     """Sanitize a string to be used as a filename."""
     # Replace problematic characters with underscores
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, "_")
+    name = name.translate(_SANITIZE_TABLE)
     # Remove leading/trailing spaces and dots
     name = name.strip(". ")
     # Limit length
@@ -254,9 +297,10 @@ if __name__ == "__main__":
         print(f"Found {len(timelines)} timeline(s)")
         print("")
 
+        jobs = []
         for idx, timeline in enumerate(timelines, 1):
             # Create filename based on timeline label
-            timeline_name = sanitize_filename(timeline.label)
+            timeline_name = sanitize_filename(timeline.get("label"))
             d2_output_file = os.path.join(
                 output_path, f"{root_filename}_{timeline_name}.d2"
             )
@@ -264,7 +308,7 @@ if __name__ == "__main__":
                 output_path, f"{root_filename}_{timeline_name}.svg"
             )
 
-            print(f"[{idx}/{len(timelines)}] Processing timeline: {timeline.label}")
+            print(f"[{idx}/{len(timelines)}] Processing timeline: {timeline.get('label')}")
 
             # Generate D2 content for this timeline
             d2_content = timeline_processor.generate_timeline_d2(timeline)
@@ -272,18 +316,28 @@ if __name__ == "__main__":
             if d2_content:
                 save_d2(d2_output_file, d2_content)
                 print(f"  ✓ D2 file: {d2_output_file}")
-
-                if render_d2_to_svg(d2_output_file, svg_output_file):
-                    print(f"  ✓ SVG file: {svg_output_file}")
-                else:
-                    print(
-                        f"  → You can render manually: d2 {d2_output_file} {svg_output_file}"
-                    )
+                jobs.append((d2_output_file, svg_output_file))
             else:
                 print(f"  ✗ Failed to generate D2 content")
 
             print("")
 
+        # Render all of the diagrams together once the D2 sources are written
+        rendered = [False] * len(jobs)
+        if jobs and d2_installed():
+            print(f"Rendering {len(jobs)} D2 diagram(s)...")
+            rendered = render_all(jobs)
+            print("")
+        for (d2_output_file, svg_output_file), ok in zip(jobs, rendered):
+            if ok:
+                print(f"  ✓ SVG file: {svg_output_file}")
+            else:
+                print(
+                    f"  → You can render manually: d2 {d2_output_file} {svg_output_file}"
+                )
+        if jobs:
+            print("")
+
         print(f"Completed processing {len(timelines)} timeline(s)")
         if errors.error_count() > 0:
             print(f"Errors encountered: {errors.dump(0)}")
@@ -1,20 +1,38 @@
 import os
 import argparse
-from uuid import uuid4
-from yattag import Doc
-from bs4 import BeautifulSoup
+from yattag import Doc, indent
 from usdm4.api.scheduled_instance import (
     ScheduledActivityInstance,
     ScheduledDecisionInstance,
     ScheduledInstance,
 )
-from usdm4.api.wrapper import Wrapper
-from usdm4.api.study_design import StudyDesign
 from usdm4.api.schedule_timeline_exit import ScheduleTimelineExit
 from usdm4 import USDM4
 from usdm4.builder.builder import Builder
 from simple_error_log.errors import Errors
 
+_ACTIVITY_INSTANCE = ScheduledActivityInstance.__name__
+_HEAD_LINKS = (
+    '<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">'
+    '<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">'
+)
+_GRAPH_PREAMBLE = "\ngraph TD\n"
+_MERMAID_SCRIPT = (
+    "import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';\n"
+    "mermaid.initialize({ startOnLoad: true });\n"
+)
+
+
+_USDM_SINGLETON = None
+
+
+def _get_usdm() -> USDM4:
+    # Shared across Timeline instances so USDM4 is only set up once per process
+    global _USDM_SINGLETON
+    if _USDM_SINGLETON is None:
+        _USDM_SINGLETON = USDM4()
+    return _USDM_SINGLETON
+
 
 class Timeline:
     FULL = "full"
@@ -22,18 +40,16 @@ class Timeline:
 
     def __init__(self, file_path: str, errors: Errors):
         self._errors = errors
-        self._usdm = USDM4()
+        self._usdm = _get_usdm()
         self._file_path = file_path
         self._builder: Builder = self._usdm.builder(errors)
+        self._wrapper = None
 
     def to_html(self, level=FULL):
-        self._builder.seed(self._file_path)
-        wrapper_dict: dict = self._builder._data_store.data
-        wrapper_dict["study"]["id"] = uuid4()
-        wrapper = Wrapper.model_validate(wrapper_dict)
+        wrapper = self._ensure_loaded()
         try:
             doc = Doc()
-            study_design = wrapper.study.versions[0].studyDesigns[0]
+            study_design = wrapper["study"]["versions"][0]["studyDesigns"][0]
             if level == self.BODY:
                 self._body(doc, study_design)
             else:
@@ -43,90 +59,91 @@ class Timeline:
             self._errors.exception(f"Failed generating HTML page at level '{level}'", e)
             return ""
 
-    def _full(self, doc, study_design: StudyDesign):
+    def _ensure_loaded(self) -> dict:
+        # Seed once, later calls reuse the same data. The traversal is read
+        # only over the builder's dicts so no Pydantic Wrapper is validated.
+        if self._wrapper is None:
+            self._builder.seed(self._file_path)
+            # DataStore keeps instances in an id-keyed dict, bind its lookup once
+            self._xref = self._builder._data_store.instance_by_id
+            self._wrapper = self._builder._data_store.data
+        return self._wrapper
+
+    def _full(self, doc, study_design: dict):
         doc.asis("<!DOCTYPE html>")
         with doc.tag("html"):
             with doc.tag("head"):
-                doc.asis(
-                    '<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css" rel="stylesheet">'
-                )
-                doc.asis(
-                    '<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">'
-                )
+                doc.asis(_HEAD_LINKS)
 
             with doc.tag("body"):
                 self._body(doc, study_design)
 
-    def _body(self, doc, study_design: StudyDesign):
-        for timeline in study_design.scheduleTimelines:
-            timings = timeline.timings
+    def _body(self, doc, study_design: dict):
+        # Local bindings keep attribute lookups out of the per-instance loop
+        xref = self._xref
+        act_name = _ACTIVITY_INSTANCE
+        for timeline in study_design["scheduleTimelines"]:
+            timings = timeline.get("timings", [])
             with doc.tag(f"main", klass="container"):
                 with doc.tag(f"h1", klass="mt-5"):
-                    doc.asis(f"{timeline.label}")
+                    doc.asis(f"{timeline.get('label')}")
                 with doc.tag(f"p", klass="lead"):
-                    doc.asis(f"Condition: {timeline.entryCondition}")
+                    doc.asis(f"Condition: {timeline['entryCondition']}")
                 with doc.tag("pre", klass="mermaid"):
-                    # doc.asis("\ngraph LR\n")
-                    doc.asis("\ngraph TD\n")
-                    # doc.asis(f"{timeline.id}([\"{timeline.entryCondition}\"])\n")
-                    doc.asis(f"{timeline.id}([{timeline.label}])\n")
-                    instance = self._get_cross_reference(timeline.entryId)
-                    if instance["instanceType"] == ScheduledActivityInstance.__name__:
-                        doc.asis(f"{instance['id']}(ScheduledActivityInstance)\n")
+                    # Build the graph text locally and emit it with one call
+                    buf = []
+                    append = buf.append
+                    # append("\ngraph LR\n")
+                    append(_GRAPH_PREAMBLE)
+                    # append(f"{timeline['id']}([\"{timeline['entryCondition']}\"])\n")
+                    append(f"{timeline['id']}([{timeline.get('label')}])\n")
+                    instance = xref(timeline["entryId"])
+                    if instance["instanceType"] == act_name:
+                        append(f"{instance['id']}(ScheduledActivityInstance)\n")
                     else:
-                        doc.asis(f"{instance['id']}{{{{ScheduledDecisionInstance}}}}\n")
-                    doc.asis(f"{timeline.id} -->|first| {instance['id']}\n")
+                        append(f"{instance['id']}{{{{ScheduledDecisionInstance}}}}\n")
+                    append(f"{timeline['id']} -->|first| {instance['id']}\n")
                     prev_instance = instance
-                    instance = self._get_cross_reference(instance["defaultConditionId"])
+                    instance = xref(instance["defaultConditionId"])
                     while instance:
-                        if (
-                            instance["instanceType"]
-                            == ScheduledActivityInstance.__name__
-                        ):
-                            doc.asis(f"{instance['id']}(ScheduledActivityInstance)\n")
+                        if instance["instanceType"] == act_name:
+                            append(f"{instance['id']}(ScheduledActivityInstance)\n")
                         else:
-                            doc.asis(
+                            append(
                                 f"{instance['id']}{{{{ScheduledDecisionInstance}}}}\n"
                             )
                             for condition in instance["conditionAssignments"]:
-                                doc.asis(
+                                append(
                                     f"{instance['id']} -->|{condition['condition']}| {condition['conditionTargetId']}\n"
                                 )
-                        doc.asis(
+                        append(
                             f"{prev_instance['id']} -->|default| {instance['id']}\n"
                         )
                         prev_instance = instance
-                        instance = self._get_cross_reference(
-                            prev_instance["defaultConditionId"]
-                        )
-                    exit = self._get_cross_reference(prev_instance["timelineExitId"])
-                    doc.asis(f"{exit['id']}([Exit])\n")
-                    doc.asis(f"{prev_instance['id']} -->|exit| {exit['id']}\n")
+                        instance = xref(prev_instance["defaultConditionId"])
+                    exit = xref(prev_instance["timelineExitId"])
+                    append(f"{exit['id']}([Exit])\n")
+                    append(f"{prev_instance['id']} -->|exit| {exit['id']}\n")
                     for timing in timings:
-                        doc.asis(
-                            f"{timing.id}(({timing.label}\n{timing.type.decode}\n{timing.value}\n{timing.windowLower}..{timing.windowUpper}))\n"
-                        )
-                        doc.asis(
-                            f"{timing.relativeFromScheduledInstanceId} -->|from| {timing.id}\n"
-                        )
-                        doc.asis(
-                            f"{timing.id} -->|to| {timing.relativeToScheduledInstanceId}\n"
+                        timing_id = timing["id"]
+                        get = timing.get
+                        append(
+                            f"{timing_id}(({get('label')}\n{timing['type']['decode']}\n{timing['value']}\n{get('windowLower')}..{get('windowUpper')}))\n"
+                            f"{timing['relativeFromScheduledInstanceId']} -->|from| {timing_id}\n"
+                            f"{timing_id} -->|to| {get('relativeToScheduledInstanceId')}\n"
                         )
+                    # Escaped text (-->) so the page is well formed, mermaid decodes entities
+                    doc.text("".join(buf))
         with doc.tag("script", type="module"):
-            doc.asis(
-                "import mermaid from 'https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs';\n"
-            )
-            doc.asis("mermaid.initialize({ startOnLoad: true });\n")
+            doc.asis(_MERMAID_SCRIPT)
 
     def _get_cross_reference(self, id):
-        return self._builder._data_store.instance_by_id(id)
+        return self._xref(id)
 
 
 def save_html(file_path, result):
-    soup = BeautifulSoup(result, "html.parser")
-    data = soup.prettify()
     with open(file_path, "w") as f:
-        f.write(data)
+        f.write(indent(result))
 
 
 if __name__ == "__main__":
@@ -41,12 +41,14 @@ def get_image_datetime(image_path):
         return None
 
 
-def get_file_modification_time(file_path):
+def get_file_modification_time(file_path, timestamp=None):
     """
     Get file modification time as fallback.
+    If timestamp (st_mtime) is already known it is converted directly.
     """
     try:
-        timestamp = os.path.getmtime(file_path)
+        if timestamp is None:
+            timestamp = os.path.getmtime(file_path)
         return datetime.fromtimestamp(timestamp)
     except Exception as e:
         print(f"Warning: Could not get modification time for {file_path}: {e}")
@@ -56,18 +58,27 @@ def get_file_modification_time(file_path):
 def get_image_files(directory):
     """
     Get all jpg and png files in the directory.
+    Returns a list of (path, st_mtime) tuples.
     """
     directory = Path(directory)
     image_extensions = {'.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG'}
     
     image_files = []
-    for file_path in directory.iterdir():
-        if file_path.is_file() and file_path.suffix in image_extensions:
-            image_files.append(file_path)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and os.path.splitext(entry.name)[1] in image_extensions:
+                image_files.append((directory / entry.name, entry.stat().st_mtime))
     
     return image_files
 
 
+def _date_key(dt):
+    """
+    Integer grouping key (YYYYMMDD) for a datetime.
+    """
+    return dt.year * 10000 + dt.month * 100 + dt.day
+
+
 def rename_images(directory, dry_run=False):
     """
     Rename all images in directory based on metadata timestamps.
@@ -97,12 +108,12 @@ def rename_images(directory, dry_run=False):
     
     # Extract timestamps for each image
     images_with_times = []
-    for image_path in image_files:
+    for image_path, mtime in image_files:
         dt = get_image_datetime(image_path)
         
         # Fallback to file modification time if no EXIF data
         if dt is None:
-            dt = get_file_modification_time(image_path)
+            dt = get_file_modification_time(image_path, mtime)
         
         if dt is None:
             print(f"Warning: Skipping {image_path.name} - no timestamp available")
@@ -120,16 +131,15 @@ def rename_images(directory, dry_run=False):
     # Group by date and assign indices
     images_by_date = defaultdict(list)
     for image_path, dt in images_with_times:
-        date_str = dt.strftime('%Y-%m-%d')
-        images_by_date[date_str].append((image_path, dt))
+        images_by_date[_date_key(dt)].append((image_path, dt))
     
     # Rename files
     renamed_count = 0
     skipped_count = 0
     
-    for date_str, images in sorted(images_by_date.items()):
-        # Sort images within the same day by time
-        images.sort(key=lambda x: x[1])
+    for _, images in sorted(images_by_date.items()):
+        # Already in time order as images_with_times was sorted
+        date_str = images[0][1].strftime('%Y-%m-%d')
         
         for index, (image_path, dt) in enumerate(images, start=1):
             original_name = image_path.name
@@ -5,29 +5,26 @@ Creates an HTML page with a D3.js vertical timeline displaying nodes with hover
 """
 
 import json
+import os
 import sys
+from collections import defaultdict
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_json_data(filepath):
-    """Load JSON data from file."""
-    with open(filepath, 'r') as f:
-        return json.load(f)
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
+# Files at or above this size are stream-parsed (only 'nodes' is extracted)
+STREAM_THRESHOLD = 1024 * 1024
 
-def generate_html(data, output_path='expanded_timeline.html'):
-    """
-    Generate HTML with D3.js vertical timeline visualization.
-    
-    Args:
-        data: Dictionary containing 'nodes' list
-        output_path: Output HTML file path
-    """
-    
-    # Convert Python dict to JSON string for embedding in JavaScript
-    json_data = json.dumps(data, indent=2)
-    
-    html_template = f"""<!DOCTYPE html>
+# Static page content either side of the embedded JSON payload
+_HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -41,69 +38,69 @@ def generate_html(data, output_path='expanded_timeline.html'):
     <script src="https://d3js.org/d3.v7.min.js"></script>
     
     <style>
-        body {{
+        body {
             background-color: #f8f9fa;
             padding: 20px 0;
-        }}
+        }
         
-        .page-header {{
+        .page-header {
             background: linear-gradient(135deg, #2c3e50 0%, #3498db 100%);
             color: white;
             padding: 40px 0;
             margin-bottom: 40px;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .timeline-container {{
+        .timeline-container {
             max-width: 900px;
             margin: 0 auto;
             padding: 20px;
-        }}
+        }
         
-        .timeline-svg {{
+        .timeline-svg {
             width: 100%;
             overflow: visible;
-        }}
+        }
         
-        .timeline-line {{
+        .timeline-line {
             stroke: #3498db;
             stroke-width: 4;
             fill: none;
-        }}
+        }
         
-        .timeline-node {{
+        .timeline-node {
             cursor: pointer;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .timeline-node:hover .node-circle {{
+        .timeline-node:hover .node-circle {
             transform: scale(1.3);
-        }}
+        }
         
-        .node-circle {{
+        .node-circle {
             fill: #3498db;
             stroke: #2c3e50;
             stroke-width: 2;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .node-circle.has-encounter {{
+        .node-circle.has-encounter {
             fill: #e74c3c;
-        }}
+        }
         
-        .node-label {{
+        .node-label {
             font-size: 13px;
             font-weight: 600;
             fill: #2c3e50;
-        }}
+        }
         
-        .node-time {{
+        .node-time {
             font-size: 11px;
             fill: #7f8c8d;
             font-family: 'Courier New', monospace;
-        }}
+        }
         
-        .tooltip {{
+        .tooltip {
             position: fixed;
             background-color: white;
             border: 1px solid #dee2e6;
@@ -115,29 +112,29 @@ def generate_html(data, output_path='expanded_timeline.html'):
             box-shadow: 0 6px 12px rgba(0,0,0,0.15);
             max-width: 400px;
             z-index: 1000;
-        }}
+        }
         
-        .tooltip.visible {{
+        .tooltip.visible {
             opacity: 1;
-        }}
+        }
         
-        .tooltip-title {{
+        .tooltip-title {
             font-weight: 700;
             font-size: 15px;
             color: #2c3e50;
             margin-bottom: 10px;
             border-bottom: 2px solid #3498db;
             padding-bottom: 6px;
-        }}
+        }
         
-        .tooltip-time {{
+        .tooltip-time {
             font-size: 12px;
             color: #7f8c8d;
             margin-bottom: 10px;
             font-family: 'Courier New', monospace;
-        }}
+        }
         
-        .tooltip-encounter {{
+        .tooltip-encounter {
             font-size: 13px;
             color: #e74c3c;
             font-weight: 600;
@@ -145,75 +142,75 @@ def generate_html(data, output_path='expanded_timeline.html'):
             padding: 6px 10px;
             background-color: #fdf2f2;
             border-radius: 4px;
-        }}
+        }
         
-        .tooltip-section {{
+        .tooltip-section {
             font-size: 12px;
             color: #34495e;
             margin-top: 8px;
-        }}
+        }
         
-        .tooltip-section-title {{
+        .tooltip-section-title {
             font-weight: 600;
             color: #2c3e50;
             margin-bottom: 5px;
-        }}
+        }
         
-        .activity-item {{
+        .activity-item {
             padding: 4px 0 4px 15px;
             border-left: 2px solid #3498db;
             margin: 4px 0;
             font-size: 11px;
-        }}
+        }
         
-        .activity-parent {{
+        .activity-parent {
             font-size: 10px;
             color: #95a5a6;
             font-style: italic;
-        }}
+        }
         
-        .procedure-item {{
+        .procedure-item {
             font-size: 10px;
             color: #7f8c8d;
             padding-left: 10px;
-        }}
+        }
         
-        .legend {{
+        .legend {
             display: flex;
             justify-content: center;
             gap: 30px;
             margin-bottom: 30px;
-        }}
+        }
         
-        .legend-item {{
+        .legend-item {
             display: flex;
             align-items: center;
             gap: 8px;
             font-size: 13px;
             color: #2c3e50;
-        }}
+        }
         
-        .legend-dot {{
+        .legend-dot {
             width: 16px;
             height: 16px;
             border-radius: 50%;
             border: 2px solid #2c3e50;
-        }}
+        }
         
-        .legend-dot.regular {{
+        .legend-dot.regular {
             background-color: #3498db;
-        }}
+        }
         
-        .legend-dot.encounter {{
+        .legend-dot.encounter {
             background-color: #e74c3c;
-        }}
+        }
         
-        .scroll-indicator {{
+        .scroll-indicator {
             text-align: center;
             color: #95a5a6;
             font-size: 12px;
             margin-bottom: 20px;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -255,17 +252,20 @@ def generate_html(data, output_path='expanded_timeline.html'):
     
     <script>
         // Data from Python
-        const data = {json_data};
+        const data = """
+
+_HTML_TAIL = """;
         
         // Configuration
-        const config = {{
+        const config = {
             nodeRadius: 10,
             nodeSpacingY: 80,
             lineX: 120,
             labelOffsetX: 25,
             timeOffsetX: -20,
-            margin: {{ top: 40, right: 40, bottom: 40, left: 40 }}
-        }};
+            cullBuffer: 8,
+            margin: { top: 40, right: 40, bottom: 40, left: 40 }
+        };
         
         // Get nodes data
         const nodes = data.nodes || [];
@@ -274,32 +274,32 @@ def generate_html(data, output_path='expanded_timeline.html'):
         const tooltip = d3.select("#tooltip");
         
         // Create vertical timeline
-        function createTimeline() {{
+        function createTimeline() {
             const container = d3.select("#timeline-container");
             const svg = d3.select("#timeline-svg");
             
-            if (nodes.length === 0) {{
+            if (nodes.length === 0) {
                 container.html('<div class="text-center text-muted p-5">No nodes to display</div>');
                 return;
-            }}
+            }
             
             // Calculate SVG dimensions
             const svgHeight = config.margin.top + (nodes.length * config.nodeSpacingY) + config.margin.bottom;
             const svgWidth = 800;
             
-            svg.attr("viewBox", `0 0 ${{svgWidth}} ${{svgHeight}}`)
+            svg.attr("viewBox", `0 0 ${svgWidth} ${svgHeight}`)
                .attr("height", svgHeight);
             
             const g = svg.append("g")
-                .attr("transform", `translate(${{config.margin.left}},${{config.margin.top}})`);
+                .attr("transform", `translate(${config.margin.left},${config.margin.top})`);
             
             // Create node positions
-            const nodePositions = nodes.map((node, index) => ({{
+            const nodePositions = nodes.map((node, index) => ({
                 ...node,
                 x: config.lineX,
                 y: index * config.nodeSpacingY,
                 index: index
-            }}));
+            }));
             
             // Draw the timeline line
             const lineGenerator = d3.line()
@@ -312,106 +312,135 @@ def generate_html(data, output_path='expanded_timeline.html'):
                 .attr("class", "timeline-line")
                 .attr("d", lineGenerator);
             
-            // Create node groups
-            const nodeGroups = g.selectAll(".timeline-node")
-                .data(nodePositions)
-                .enter()
-                .append("g")
-                .attr("class", "timeline-node")
-                .attr("transform", d => `translate(${{d.x}},${{d.y}})`)
-                .on("mouseover", function(event, d) {{
-                    showTooltip(event, d);
-                }})
-                .on("mousemove", function(event, d) {{
-                    moveTooltip(event);
-                }})
-                .on("mouseout", function() {{
-                    hideTooltip();
-                }});
+            // Node groups are only created for the rows near the viewport
+            const nodeLayer = g.append("g");
+            let renderedRange = null;
+            
+            // Index range of nodes on screen, plus a buffer either side
+            function visibleRange() {
+                const rect = svg.node().getBoundingClientRect();
+                const scale = Math.min(rect.width / svgWidth, rect.height / svgHeight) || 1;
+                const top = rect.top + (rect.height - svgHeight * scale) / 2 + config.margin.top * scale;
+                const spacing = config.nodeSpacingY * scale;
+                const first = Math.floor(-top / spacing) - config.cullBuffer;
+                const last = Math.ceil((window.innerHeight - top) / spacing) + config.cullBuffer;
+                return [Math.max(0, first), Math.min(nodePositions.length - 1, last)];
+            }
             
-            // Add circles
-            nodeGroups.append("circle")
-                .attr("class", d => `node-circle ${{d.encounter ? 'has-encounter' : ''}}`)
-                .attr("r", config.nodeRadius)
-                .attr("cx", 0)
-                .attr("cy", 0);
+            // Add groups entering the range and remove those leaving it
+            function renderVisible() {
+                const [first, last] = visibleRange();
+                if (renderedRange && renderedRange[0] === first && renderedRange[1] === last) {
+                    return;
+                }
+                renderedRange = [first, last];
+                nodeLayer.selectAll(".timeline-node")
+                    .data(nodePositions.slice(first, last + 1), d => d.index)
+                    .join(enter => {
+                        const nodeGroups = enter.append("g")
+                            .attr("class", "timeline-node")
+                            .attr("transform", d => `translate(${d.x},${d.y})`)
+                            .on("mouseover", function(event, d) {
+                                showTooltip(event, d);
+                            })
+                            .on("mousemove", function(event, d) {
+                                moveTooltip(event);
+                            })
+                            .on("mouseout", function() {
+                                hideTooltip();
+                            });
+                        
+                        // Add circles
+                        nodeGroups.append("circle")
+                            .attr("class", d => `node-circle ${d.encounter ? 'has-encounter' : ''}`)
+                            .attr("r", config.nodeRadius)
+                            .attr("cx", 0)
+                            .attr("cy", 0);
+                        
+                        // Add labels (right side)
+                        nodeGroups.append("text")
+                            .attr("class", "node-label")
+                            .attr("x", config.labelOffsetX)
+                            .attr("y", 0)
+                            .attr("dy", "0.35em")
+                            .text(d => d.label || 'Unnamed');
+                        
+                        // Add time (left side)
+                        nodeGroups.append("text")
+                            .attr("class", "node-time")
+                            .attr("x", config.timeOffsetX)
+                            .attr("y", 0)
+                            .attr("dy", "0.35em")
+                            .attr("text-anchor", "end")
+                            .text(d => d.time || '');
+                        
+                        return nodeGroups;
+                    });
+            }
             
-            // Add labels (right side)
-            nodeGroups.append("text")
-                .attr("class", "node-label")
-                .attr("x", config.labelOffsetX)
-                .attr("y", 0)
-                .attr("dy", "0.35em")
-                .text(d => d.label || 'Unnamed');
+            // Re-cull at most once per animation frame
+            let pending = false;
+            function scheduleRender() {
+                if (!pending) {
+                    pending = true;
+                    window.requestAnimationFrame(() => {
+                        pending = false;
+                        renderVisible();
+                    });
+                }
+            }
             
-            // Add time (left side)
-            nodeGroups.append("text")
-                .attr("class", "node-time")
-                .attr("x", config.timeOffsetX)
-                .attr("y", 0)
-                .attr("dy", "0.35em")
-                .attr("text-anchor", "end")
-                .text(d => d.time || '');
-        }}
+            window.addEventListener("scroll", scheduleRender, { passive: true });
+            window.addEventListener("resize", scheduleRender);
+            renderVisible();
+        }
         
         // Show tooltip
-        function showTooltip(event, node) {{
-            let html = `<div class="tooltip-title">${{node.label || 'Unnamed'}}</div>`;
-            html += `<div class="tooltip-time">Time: ${{node.time || 'N/A'}}</div>`;
+        function showTooltip(event, node) {
+            let html = `<div class="tooltip-title">${node.label || 'Unnamed'}</div>`;
+            html += `<div class="tooltip-time">Time: ${node.time || 'N/A'}</div>`;
             
             // Encounter info
-            if (node.encounter) {{
-                html += `<div class="tooltip-encounter">Encounter: ${{node.encounter}}</div>`;
-            }}
+            if (node.encounter) {
+                html += `<div class="tooltip-encounter">Encounter: ${node.encounter}</div>`;
+            }
             
-            // Activities info
-            const activities = node.activities?.items || [];
-            if (activities.length > 0) {{
+            // Activities info, grouped by parent in Python
+            const groups = node.activities?.groups || [];
+            const count = node.activities?.count || 0;
+            if (count > 0) {
                 html += '<div class="tooltip-section">';
-                html += `<div class="tooltip-section-title">Activities (${{activities.length}}):</div>`;
-                
-                // Group activities by parent
-                const groupedActivities = {{}};
-                activities.forEach(activity => {{
-                    const parent = activity.parent || 'Other';
-                    if (!groupedActivities[parent]) {{
-                        groupedActivities[parent] = [];
-                    }}
-                    groupedActivities[parent].push(activity);
-                }});
+                html += `<div class="tooltip-section-title">Activities (${count}):</div>`;
                 
                 // Display grouped activities
-                Object.keys(groupedActivities).forEach(parent => {{
-                    if (parent !== 'Other') {{
-                        html += `<div class="activity-parent">${{parent}}</div>`;
-                    }}
-                    groupedActivities[parent].forEach(activity => {{
-                        html += `<div class="activity-item">${{activity.label || 'Unnamed activity'}}`;
+                groups.forEach(group => {
+                    if (group.parent !== 'Other') {
+                        html += `<div class="activity-parent">${group.parent}</div>`;
+                    }
+                    group.items.forEach(activity => {
+                        html += `<div class="activity-item">${activity.label || 'Unnamed activity'}`;
                         
-                        // Show procedures if any
-                        const procedures = activity.procedures?.filter(p => p && p.trim() !== '') || [];
-                        if (procedures.length > 0) {{
-                            procedures.forEach(proc => {{
-                                html += `<div class="procedure-item">→ ${{proc}}</div>`;
-                            }});
-                        }}
+                        // Show procedures if any (blanks already removed)
+                        (activity.procedures || []).forEach(proc => {
+                            html += `<div class="procedure-item">→ ${proc}</div>`;
+                        });
                         html += '</div>';
-                    }});
-                }});
+                    });
+                });
                 
                 html += '</div>';
-            }} else {{
+            } else {
                 html += '<div class="tooltip-section"><em>No activities</em></div>';
-            }}
+            }
             
             tooltip.html(html)
                 .classed("visible", true);
             
             moveTooltip(event);
-        }}
+        }
         
         // Move tooltip with mouse
-        function moveTooltip(event) {{
+        function moveTooltip(event) {
             const tooltipNode = tooltip.node();
             const tooltipRect = tooltipNode.getBoundingClientRect();
             const windowWidth = window.innerWidth;
@@ -421,41 +450,108 @@ def generate_html(data, output_path='expanded_timeline.html'):
             let top = event.clientY - 15;
             
             // Prevent tooltip from going off screen right
-            if (left + tooltipRect.width > windowWidth - 10) {{
+            if (left + tooltipRect.width > windowWidth - 10) {
                 left = event.clientX - tooltipRect.width - 15;
-            }}
+            }
             
             // Prevent tooltip from going off screen bottom
-            if (top + tooltipRect.height > windowHeight - 10) {{
+            if (top + tooltipRect.height > windowHeight - 10) {
                 top = windowHeight - tooltipRect.height - 10;
-            }}
+            }
             
             // Prevent tooltip from going off screen top
-            if (top < 10) {{
+            if (top < 10) {
                 top = 10;
-            }}
+            }
             
             tooltip
                 .style("left", left + "px")
                 .style("top", top + "px");
-        }}
+        }
         
         // Hide tooltip
-        function hideTooltip() {{
+        function hideTooltip() {
             tooltip.classed("visible", false);
-        }}
+        }
         
         // Initialize
         createTimeline();
         
-        console.log(`Created vertical timeline with ${{nodes.length}} nodes`);
+        console.log(`Created vertical timeline with ${nodes.length} nodes`);
     </script>
 </body>
 </html>"""
+
+
+def load_json_data(filepath):
+    """Load JSON data from file."""
+    if ijson is not None and os.path.getsize(filepath) >= STREAM_THRESHOLD:
+        with open(filepath, 'rb') as f:
+            return {'nodes': list(ijson.items(f, 'nodes.item', use_float=True))}
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def _to_json(data):
+    """Serialise data as indented JSON safe for embedding in a <script> block."""
+    if orjson is not None:
+        json_data = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    else:
+        json_data = json.dumps(data, indent=2)
+    return json_data.replace('</', '<\\/')
+
+
+def group_activities(data):
+    """
+    Return a copy of data with each node's activities grouped by parent.
+
+    The tooltip only needs the grouped form, so doing this once here keeps the
+    per-hover JavaScript to a straight render. Blank procedures are dropped.
+    """
+    nodes = []
+    for node in data.get('nodes', []):
+        items = (node.get('activities') or {}).get('items') or []
+        groups = defaultdict(list)
+        for activity in items:
+            procedures = activity.get('procedures') or []
+            # Only copy the list when there is something to drop
+            if not all(p and p.strip() for p in procedures):
+                procedures = [p for p in procedures if p and p.strip()]
+            groups[activity.get('parent') or 'Other'].append(
+                {'label': activity.get('label'), 'procedures': procedures}
+            )
+        node = dict(node)
+        node['activities'] = {
+            'count': len(items),
+            'groups': [{'parent': parent, 'items': group} for parent, group in groups.items()],
+        }
+        nodes.append(node)
+    return {**data, 'nodes': nodes}
+
+
+def generate_html(data, output_path='expanded_timeline.html'):
+    """
+    Generate HTML with D3.js vertical timeline visualization.
+    
+    The page is written piecewise, the JSON payload between the static head
+    and tail, so the full document is never held in memory as one string.
+    
+    Args:
+        data: Dictionary containing 'nodes' list
+        output_path: Output HTML file path
+    """
+    
+    # Convert Python dict to JSON string for embedding in JavaScript
+    json_data = _to_json(group_activities(data))
     
     # Write HTML to file
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_template)
+        f.write(_HTML_HEAD)
+        f.write(json_data)
+        f.write(_HTML_TAIL)
     
     print(f"Generated expanded timeline visualization: {output_path}")
     return output_path
@@ -1,66 +1,22 @@
 import os
+from html import escape
 import argparse
 import warnings
-from bs4 import BeautifulSoup
-from yattag import Doc
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning
 from usdm4 import USDM4
 from usdm4.builder.builder import Builder, DataStore
 from simple_error_log.errors import Errors
 
+# Criterion text is parsed as an HTML fragment and serialised back with
+# str(soup). The lxml parser wraps fragments in <html><body><p>, so the
+# pure-Python parser is kept to preserve the text as written.
+_PARSER = "html.parser"
 
-class IE:
-    def __init__(self, file_path: str, errors: Errors):
-        self._errors = errors
-        self._usdm = USDM4()
-        self._file_path = file_path
-        self._builder: Builder = self._usdm.builder(errors)
-
-    def to_html(self) -> str:
-        try:
-            self._builder.seed(self._file_path)
-            inc, exc = self._ie_data()
-            return self._generate_html(inc, exc)
-        except Exception as e:
-            self._errors.exception(f"Failed generating HTML page", e)
-            return ""
-
-    def _ie_data(self) -> tuple[list, list]:
-        self._data_store: DataStore = self._builder._data_store
-        inclusion = []
-        exclusion = []
-        for ec in self._data_store.instances_by_klass(
-            "EligibilityCriterion"
-        ):
-            eci = self._data_store.instance_by_id(
-                ec["criterionItemId"]
-            )
-            translated_text = self._translate_references(
-                eci, eci["text"]
-            )
-            if ec["category"]["code"] == "C25532":
-                inclusion.append({"identifier": ec["identifier"], "text": translated_text})
-            if ec["category"]["code"] == "C25370":
-                exclusion.append({"identifier": ec["identifier"], "text": translated_text})
-        return inclusion, exclusion
+# Short criterion text can look like a file name or URL to soup, the warning
+# is noise here so silence it once rather than recording warnings per parse
+warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
 
-    def _generate_html(self, inclusion: str, exclusion: str):
-        doc = Doc()
-        with doc.tag(f"div", klass="container-fluid px-4 times-new-roman"):
-            with doc.tag("div", klass="row g-3"):
-                with doc.tag("div", klass="col-12"):
-                    with doc.tag("h2", klass=""):
-                        doc.asis("5.2 Inclusion Criteria")
-                    with doc.tag("p", klass=""):
-                        doc.asis("To be eligible to participate in this trial, an individual must meet all the following criteria:")
-                    self._ie_table(doc, inclusion)
-                    with doc.tag(f"h2", klass=""):
-                        doc.asis("5.3 Exclusion Criteria")
-                    with doc.tag(f"p", klass=""):
-                        doc.asis("An individual who meets any of the following criteria will be excluded from participation in this trial:")
-                    self._ie_table(doc, exclusion)
-
-        # Generate HTML
-        html = f"""<!DOCTYPE html>
+_HTML_HEAD = """<!DOCTYPE html>
             <html lang="en">
                 <head>
                     <meta charset="UTF-8">
@@ -69,88 +25,167 @@ class IE:
                     <link href="https://bootswatch.com/5/zephyr/bootstrap.min.css" rel="stylesheet">
                     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">
                     <style>
-                        body {{
+                        body {
                             background-color: #f8f9fa;
                             font-size: 0.9rem;
-                        }}
-                        .page-header {{
+                        }
+                        .page-header {
                             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
                             color: white;
                             padding: 1.5rem 0;
                             margin-bottom: 1.5rem;
                             border-radius: 0;
-                        }}
-                        .card {{
+                        }
+                        .card {
                             transition: transform 0.2s;
-                        }}
-                        .card:hover {{
+                        }
+                        .card:hover {
                             transform: translateY(-2px);
-                        }}
-                        .card-header {{
+                        }
+                        .card-header {
                             font-weight: 500;
                             letter-spacing: 0.3px;
-                        }}
-                        .btn-group-sm .btn {{
+                        }
+                        .btn-group-sm .btn {
                             min-width: 60px;
-                        }}
+                        }
                         .times-new-roman,
-                        .times-new-roman * {{
+                        .times-new-roman * {
                             font-family: 'Times New Roman', Times, serif !important;
                             font-size: 12pt;
-                        }}
-                        .times-new-roman h2 {{
+                        }
+                        .times-new-roman h2 {
                             font-size: 14pt;
                             font-weight: bold;
-                        }}
+                        }
                     </style>
                 </head>
                 <body>
-                    {doc.getvalue()}
+                    """
+
+_HTML_TAIL = """
                     <div class="container-fluid px-4 py-3">
                         <small class="text-muted">Generated with USDM4 Utility</small>
                     </div>
                 </body>
             </html>
-        """
-        return html
-
-    def _ie_table(self, doc, criteria: list):
-        with doc.tag("table"):
-            for c in criteria:
-                with doc.tag("tr"):
-                    with doc.tag("td", style="vertical-align: top;"):
-                        doc.asis(f"{c['identifier']}:")
-                    with doc.tag("td", style="vertical-align: top;"):
-                        doc.asis(f"{c['text']}")
+"""
 
-    def _translate_references(self, instance: dict, text: str) -> str:
-        text = self._wrap_tag(text, "u")
-        text = self._wrap_tag(text, "i")
-        return self._translate_references_recurse(instance, text)
 
-    def _wrap_tag(self, text: str, tag: str) -> str:
+class IE:
+    def __init__(self, file_path: str, errors: Errors):
+        self._errors = errors
+        self._usdm = USDM4()
+        self._file_path = file_path
+        self._builder: Builder = self._usdm.builder(errors)
+        self._resolve_cache: dict[tuple[str, str], str] = {}
+        self._dict_maps: dict[str, dict[str, str]] = {}
+
+    def to_html(self) -> str:
+        try:
+            inc, exc = self._load()
+            return "".join(self._generate_html(inc, exc))
+        except Exception as e:
+            self._errors.exception(f"Failed generating HTML page", e)
+            return ""
+
+    def to_file(self, file_path: str) -> bool:
+        # As to_html but the page is written piecewise rather than built in memory
+        try:
+            inc, exc = self._load()
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.writelines(self._generate_html(inc, exc))
+            return True
+        except Exception as e:
+            self._errors.exception(f"Failed writing HTML page", e)
+            return False
+
+    def _load(self) -> tuple[list, list]:
+        self._builder.seed(self._file_path)
+        return self._ie_data()
+
+    def _ie_data(self) -> tuple[list, list]:
+        self._data_store: DataStore = self._builder._data_store
+        # instance_by_id is a dict lookup in the DataStore, bind it once for the loop
+        instance_by_id = self._data_store.instance_by_id
+        inclusion = []
+        exclusion = []
+        for ec in self._data_store.instances_by_klass(
+            "EligibilityCriterion"
+        ):
+            eci = instance_by_id(ec["criterionItemId"])
+            translated_text = self._translate_references(
+                eci, eci["text"]
+            )
+            code = ec["category"]["code"]
+            if code == "C25532":
+                inclusion.append({"identifier": ec["identifier"], "text": translated_text})
+            elif code == "C25370":
+                exclusion.append({"identifier": ec["identifier"], "text": translated_text})
+        return inclusion, exclusion
+
+    def _generate_html(self, inclusion: list, exclusion: list):
+        yield _HTML_HEAD
+        yield '<div class="container-fluid px-4 times-new-roman"><div class="row g-3"><div class="col-12">'
+        yield '<h2 class="">5.2 Inclusion Criteria</h2>'
+        yield '<p class="">To be eligible to participate in this trial, an individual must meet all the following criteria:</p>'
+        yield from self._ie_table(inclusion)
+        yield '<h2 class="">5.3 Exclusion Criteria</h2>'
+        yield '<p class="">An individual who meets any of the following criteria will be excluded from participation in this trial:</p>'
+        yield from self._ie_table(exclusion)
+        yield "</div></div></div>"
+        yield _HTML_TAIL
+
+    def _ie_table(self, criteria: list):
+        yield "<table>"
+        for c in criteria:
+            yield (
+                f'<tr><td style="vertical-align: top;">{escape(str(c["identifier"]))}:</td>'
+                f'<td style="vertical-align: top;">{c["text"]}</td></tr>'
+            )
+        yield "</table>"
+
+    def _translate_references(self, instance: dict, text: str) -> str:
+        if "usdm:" not in text:
+            return text
+        key = (instance["id"], text)
+        if key in self._resolve_cache:
+            return self._resolve_cache[key]
+        # Parse once, wrap and resolve in place, serialise once
         soup = self._get_soup(text)
+        self._wrap_tags(soup, ["u", "i"])
+        self._translate_references_recurse(instance, soup)
+        result = str(soup)
+        self._resolve_cache[key] = result
+        return result
+
+    def _wrap_tags(self, soup, tags: list[str]) -> None:
         for ref in soup(["usdm:ref", "usdm:tag"]):
-            ref.wrap(soup.new_tag(tag))
-        return str(soup)
+            for tag in tags:
+                ref.wrap(soup.new_tag(tag))
 
-    def _translate_references_recurse(self, instance: dict, text: str) -> str:
-        # print(f"LEVEL: {text}")
-        soup = self._get_soup(text)
+    def _translate_references_recurse(self, instance: dict, soup):
+        # print(f"LEVEL: {soup}")
         for ref in soup(["usdm:ref", "usdm:tag"]):
             try:
                 if ref.name == "usdm:ref":
                     text = self._resolve_usdm_ref(instance, ref)
-                    ref.replace_with(self._translate_references_recurse(instance, text))
+                    ref.replace_with(self._resolved_content(instance, text))
                 if ref.name == "usdm:tag":
                     text = self._resolve_usdm_tag(instance, ref)
-                    ref.replace_with(self._translate_references_recurse(instance, text))
+                    ref.replace_with(self._resolved_content(instance, text))
             except Exception as e:
                 errors.exception(
                     f"Exception raised while attempting to translate '{ref}' while generating the HTML document, see the logs for more info",
                     e,
                 )
-        return str(soup)
+        return soup
+
+    def _resolved_content(self, instance: dict, text: str):
+        # Plain text needs no parse, it is inserted as a string
+        if "<" not in text and "&" not in text:
+            return text
+        return self._translate_references_recurse(instance, self._get_soup(text))
 
     def _resolve_usdm_ref(self, instance, ref) -> str:
         attributes = ref.attrs
@@ -160,34 +195,32 @@ class IE:
 
     def _resolve_usdm_tag(self, instance, ref) -> str:
         attributes = ref.attrs
-        dictionary = self._data_store.instance_by_id(instance["dictionaryId"])
-        if dictionary:
-            for p_map in dictionary["parameterMaps"]:
-                if p_map["tag"] == attributes["name"]:
-                    value = p_map["reference"]
-                    return value
-        return f"<i>missing dictionary reference</i>"
+        dict_id = instance["dictionaryId"]
+        if dict_id not in self._dict_maps:
+            dictionary = self._data_store.instance_by_id(dict_id)
+            # Reversed so the first map for a repeated tag wins, as before
+            self._dict_maps[dict_id] = (
+                {p["tag"]: p["reference"] for p in reversed(dictionary["parameterMaps"])}
+                if dictionary
+                else {}
+            )
+        return self._dict_maps[dict_id].get(
+            attributes["name"], "<i>missing dictionary reference</i>"
+        )
 
     def _get_soup(self, text: str):
         try:
-            with warnings.catch_warnings(record=True) as warning_list:
-                result = BeautifulSoup(text, "html.parser")
-                if warning_list:
-                    for item in warning_list:
-                        errors.debug(
-                            f"Warning raised within Soup package, processing '{text}'\nMessage returned '{item.message}'"
-                        )
-                return result
+            return BeautifulSoup(text, _PARSER)
         except Exception as e:
-            errors.exception(f"Parsing '{text}' with soup", e)
+            self._errors.exception(f"Parsing '{text}' with soup", e)
             return ""
 
 
-def save_html(file_path, result):
-    soup = BeautifulSoup(result, "html.parser")
-    data = soup.prettify()
-    with open(file_path, "w") as f:
-        f.write(data)
+def save_html(file_path, result, pretty=False):
+    if pretty:
+        result = BeautifulSoup(result, "html.parser").prettify()
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(result)
 
 
 if __name__ == "__main__":
@@ -212,6 +245,5 @@ if __name__ == "__main__":
     print("")
     errors = Errors()
     ie = IE(full_filename, errors)
-    html = ie.to_html()
+    ie.to_file(full_output_filename)
     print(f"Errors: {errors.dump(0)}")
-    save_html(full_output_filename, html)
@@ -3,6 +3,11 @@ import argparse
 from PIL import Image
 from pytesseract import pytesseract
 
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
 # See https://www.nutrient.io/blog/how-to-use-tesseract-ocr-in-python/
 
 
@@ -11,26 +16,42 @@ def save_text(file_path, data):
         f.write(data)
 
 
+def extract_texts(filenames):
+    # Tesseract ignores colour, so hand it a greyscale image to copy fewer bytes
+    if PyTessBaseAPI is not None:
+        # One in-process Tesseract instance shared by all of the images
+        with PyTessBaseAPI() as api:
+            for filename in filenames:
+                api.SetImage(Image.open(filename).convert("L"))
+                yield api.GetUTF8Text()
+    else:
+        for filename in filenames:
+            image = Image.open(filename).convert("L")
+            yield pytesseract.image_to_string(image)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         prog="USDM Simple Text from Images Program",
         description="Will display text exracted from image",
         epilog="Note: Not that sophisticated! :)",
     )
-    parser.add_argument("filename", help="The name of the image file.")
+    parser.add_argument("filenames", nargs="+", help="The name of the image file(s).")
     args = parser.parse_args()
-    filename = args.filename
-
-    input_path, tail = os.path.split(filename)
-    if not input_path:
-        input_path = os.getcwd()
-    root_filename, file_extension = os.path.splitext(filename)
-    full_input_filename = os.path.join(input_path, tail)
-    full_output_filename = os.path.join(input_path, f"{root_filename}.txt")
-
-    print(f"Input filename:  {full_input_filename}")
-    print(f"Output filename: {full_output_filename}")
 
-    image = Image.open(full_input_filename)
-    extracted_text = pytesseract.image_to_string(image)
-    save_text(full_output_filename, extracted_text)
+    files = []
+    for filename in args.filenames:
+        input_path, tail = os.path.split(filename)
+        if not input_path:
+            input_path = os.getcwd()
+        root_filename, file_extension = os.path.splitext(filename)
+        full_input_filename = os.path.join(input_path, tail)
+        full_output_filename = os.path.join(input_path, f"{root_filename}.txt")
+
+        print(f"Input filename:  {full_input_filename}")
+        print(f"Output filename: {full_output_filename}")
+        files.append((full_input_filename, full_output_filename))
+
+    texts = extract_texts([input_filename for input_filename, _ in files])
+    for (_, output_filename), extracted_text in zip(files, texts):
+        save_text(output_filename, extracted_text)
@@ -1,6 +1,7 @@
 import os
 import argparse
 import json
+from textwrap import wrap
 from uuid import uuid4
 from usdm4.api.scheduled_instance import (
     ScheduledActivityInstance,
@@ -9,137 +10,119 @@ from usdm4.api.scheduled_instance import (
 from usdm4.api.wrapper import Wrapper
 from usdm4.api.study_design import StudyDesign
 from usdm4 import USDM4
-from usdm4.builder.builder import Builder
+from usdm4.builder.builder import Builder, DataStore
 from simple_error_log.errors import Errors
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class Timeline:
-    def __init__(self, file_path: str, errors: Errors):
-        self._errors = errors
-        self._usdm = USDM4()
-        self._file_path = file_path
-        self._builder: Builder = self._usdm.builder(errors)
-
-    def to_html(self):
-        """Generate HTML with D3 visualization for all timelines."""
-        self._builder.seed(self._file_path)
-        wrapper_dict: dict = self._builder._data_store.data
-        wrapper_dict["study"]["id"] = uuid4()
-        wrapper = Wrapper.model_validate(wrapper_dict)
-
-        try:
-            study_design = wrapper.study.versions[0].studyDesigns[0]
-            return self._generate_html(study_design)
-        except Exception as e:
-            self._errors.exception(f"Failed generating HTML page", e)
-            return ""
+_ACTIVITY_INSTANCE = ScheduledActivityInstance.__name__
+_DECISION_INSTANCE = ScheduledDecisionInstance.__name__
 
-    def _generate_html(self, study_design: StudyDesign):
-        """Generate complete HTML with embedded D3 visualization."""
+# Characters per label line, roughly what fits a 70px wide line at 12px Arial
+_LABEL_LINE_CHARS = 12
 
-        # Collect all timeline data
-        timelines_data = []
-        for timeline in study_design.scheduleTimelines:
-            timeline_data = self._process_timeline(timeline)
-            if timeline_data:
-                timelines_data.append(timeline_data)
 
-        # Generate HTML
-        html = f"""<!DOCTYPE html>
+# Static page content. The CSS and script are either inlined, giving a single
+# self-contained page, or linked from shared sibling files written by to_file
+_PAGE_START = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>USDM Timeline Visualization</title>
     <script src="https://d3js.org/d3.v7.min.js"></script>
-    <style>
-        body {{
+"""
+
+_CSS = """        body {
             font-family: Arial, sans-serif;
             margin: 20px;
             background-color: #f5f5f5;
-        }}
-        .timeline-container {{
+        }
+        .timeline-container {
             background-color: white;
             margin-bottom: 40px;
             padding: 20px;
             border-radius: 8px;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        .timeline-title {{
+        }
+        .timeline-title {
             font-size: 24px;
             font-weight: bold;
             margin-bottom: 10px;
             color: #333;
-        }}
-        .timeline-condition {{
+        }
+        .timeline-condition {
             font-size: 14px;
             color: #666;
             margin-bottom: 20px;
             font-style: italic;
-        }}
-        .node {{
+        }
+        .node {
             cursor: pointer;
-        }}
-        .node rect {{
+        }
+        .node rect {
             stroke-width: 2;
-        }}
-        .node-activity circle {{
+        }
+        .node-activity circle {
             fill: #C0C0C0;
             stroke: #000000;
             stroke-width: 2;
-        }}
-        .node-decision path {{
+        }
+        .node-decision path {
             fill: #C0C0C0;
             stroke: #000000;
             stroke-width: 2;
-        }}
-        .node-exit rect {{
+        }
+        .node-exit rect {
             fill: #D3D3D3;
             stroke: #000000;
             rx: 15;
             ry: 15;
-        }}
-        .node-entry rect {{
+        }
+        .node-entry rect {
             fill: #D3D3D3;
             stroke: #000000;
             rx: 15;
             ry: 15;
-        }}
-        .node-timing circle {{
+        }
+        .node-timing circle {
             fill: #FFFFFF;
             stroke: #003366;
             stroke-width: 2;
-        }}
-        .node text {{
+        }
+        .node text {
             fill: #333;
             font-size: 12px;
             pointer-events: none;
-        }}
-        .link {{
+        }
+        .link {
             fill: none;
             stroke: #999;
             stroke-width: 2;
-        }}
-        .link-timing {{
+        }
+        .link-timing {
             fill: none;
             stroke: #003366;
             stroke-width: 2;
-        }}
-        .link-conditional {{
+        }
+        .link-conditional {
             fill: none;
             stroke: #000000;
             stroke-width: 2;
-        }}
-        .link-label {{
+        }
+        .link-label {
             font-size: 10px;
             fill: #666;
-        }}
-        .conditional-label {{
+        }
+        .conditional-label {
             font-size: 10px;
             fill: #000000;
             font-weight: bold;
-        }}
-        .tooltip {{
+        }
+        .tooltip {
             position: absolute;
             background-color: rgba(0, 0, 0, 0.8);
             color: white;
@@ -149,38 +132,70 @@ class Timeline:
             pointer-events: none;
             z-index: 1000;
             display: none;
-        }}
-    </style>
-</head>
+        }
+"""
+
+_BODY_START = """</head>
 <body>
+    <!-- Arrowhead markers shared by every timeline: black for regular and conditional links, blue for timing links -->
+    <svg width="0" height="0" style="position: absolute">
+        <defs>
+            <marker id="arrowhead" viewBox="0 -5 10 10" refX="8" refY="0" markerWidth="6" markerHeight="6" orient="auto">
+                <path d="M0,-5L10,0L0,5" fill="#000000"></path>
+            </marker>
+            <marker id="arrowhead-timing" viewBox="0 -5 10 10" refX="8" refY="0" markerWidth="6" markerHeight="6" orient="auto">
+                <path d="M0,-5L10,0L0,5" fill="#003366"></path>
+            </marker>
+            <marker id="arrowhead-conditional" viewBox="0 -5 10 10" refX="8" refY="0" markerWidth="6" markerHeight="6" orient="auto">
+                <path d="M0,-5L10,0L0,5" fill="#000000"></path>
+            </marker>
+        </defs>
+    </svg>
     <h1>USDM Timeline Visualization</h1>
     <div id="timelines"></div>
     <div class="tooltip" id="tooltip"></div>
     
-    <script>
-        const timelinesData = {self._format_timelines_data(timelines_data)};
-        
+"""
+
+_SCRIPT = """        
         // Tooltip
         const tooltip = d3.select("#tooltip");
         
-        function showTooltip(event, text) {{
+        function showTooltip(event, text) {
             tooltip
                 .style("display", "block")
                 .style("left", (event.pageX + 10) + "px")
                 .style("top", (event.pageY - 10) + "px")
                 .html(text);
-        }}
+        }
         
-        function hideTooltip() {{
+        function hideTooltip() {
             tooltip.style("display", "none");
-        }}
+        }
+        
+        // Draw a node label from its pre-wrapped lines, centred in the node
+        function drawLabel(node, d) {
+            const lineHeight = 14;
+            node.append("text")
+                .attr("x", d.width / 2)
+                .attr("y", d.height / 2)
+                .attr("text-anchor", "middle")
+                .attr("dominant-baseline", "central")
+                .attr("transform", `translate(0, ${-(d.lines.length - 1) * lineHeight / 2})`)
+                .selectAll("tspan")
+                .data(d.lines)
+                .join("tspan")
+                .attr("x", d.width / 2)
+                .attr("dy", (line, i) => i === 0 ? 0 : lineHeight)
+                .text(line => line);
+        }
         
         // Create visualization for each timeline
-        timelinesData.forEach((timelineData, index) => {{
+        timelinesData.forEach((timelineData, index) => {
             const container = d3.select("#timelines")
                 .append("div")
                 .attr("class", "timeline-container")
-                .attr("id", `timeline-${{index}}`);
+                .attr("id", `timeline-${index}`);
             
             container.append("div")
                 .attr("class", "timeline-title")
@@ -194,9 +209,9 @@ class Timeline:
                 .style("overflow-x", "auto");
             
             renderTimeline(svgContainer, timelineData);
-        }});
+        });
         
-        function renderTimeline(container, data) {{
+        function renderTimeline(container, data) {
             const activityNodeRadius = 40;
             const nodeWidth = activityNodeRadius * 2;
             const nodeHeight = activityNodeRadius * 2;
@@ -213,122 +228,122 @@ class Timeline:
             
             // Calculate space needed for conditional links above timeline
             let maxConditionalHeight = 0;
-            if (data.conditionalLinks && data.conditionalLinks.length > 0) {{
+            if (data.conditionalLinks && data.conditionalLinks.length > 0) {
                 // Calculate the maximum height needed for conditional links
                 const sourceNodeLinkCount = new Map();
-                data.conditionalLinks.forEach(link => {{
+                data.conditionalLinks.forEach(link => {
                     const count = sourceNodeLinkCount.get(link.sourceId) || 0;
                     sourceNodeLinkCount.set(link.sourceId, count + 1);
-                }});
+                });
                 const maxLinksFromSingleSource = Math.max(...Array.from(sourceNodeLinkCount.values()));
                 const baseHeight = 60;
                 const heightIncrement = 40;
                 maxConditionalHeight = baseHeight + ((maxLinksFromSingleSource - 1) * heightIncrement) + 30; // +30 for label space
-            }}
+            }
             
             // Calculate positions for nodes in a straight horizontal line
             // Shift nodes down by orphanHeight AND maxConditionalHeight to make space above
-            const nodes = data.nodes.map((node, i) => {{
+            const nodes = data.nodes.map((node, i) => {
                 // Entry and exit nodes should be half height
                 const isEntryOrExit = node.type === 'entry' || node.type === 'exit';
                 const height = isEntryOrExit ? nodeHeight / 2 : nodeHeight;
                 const yPos = isEntryOrExit ? orphanHeight + maxConditionalHeight + marginTop + nodeHeight / 4 : orphanHeight + maxConditionalHeight + marginTop;
                 
-                return {{
+                return {
                     ...node,
                     x: marginLeft + i * horizontalSpacing,
                     y: yPos,
                     width: nodeWidth,
                     height: height
-                }};
-            }});
+                };
+            });
             
             // Create a map of node IDs to their positions for timing lookups
-            const nodeMap = {{}};
-            nodes.forEach(node => {{
+            const nodeMap = {};
+            nodes.forEach(node => {
                 nodeMap[node.id] = node;
-            }});
+            });
             
             // Process timing nodes and position them below the main timeline
             const timingNodes = [];
-            if (data.timings) {{
-                data.timings.forEach((timing, idx) => {{
+            if (data.timings) {
+                data.timings.forEach((timing, idx) => {
                     const fromNode = nodeMap[timing.relativeFromScheduledInstanceId];
                     const toNode = nodeMap[timing.relativeToScheduledInstanceId];
                     
-                    if (fromNode && toNode) {{
+                    if (fromNode && toNode) {
                         // Position timing node directly under the from node
                         // Account for orphan nodes AND conditional links space above
                         const timingX = fromNode.x + fromNode.width/2;
                         const timingY = orphanHeight + maxConditionalHeight + marginTop + nodeHeight + verticalSpacing;
                         
-                        timingNodes.push({{
+                        timingNodes.push({
                             ...timing,
                             x: timingX,
                             y: timingY,
                             radius: timingNodeRadius,
                             fromNode: fromNode,
                             toNode: toNode
-                        }});
-                    }}
-                }});
-            }}
+                        });
+                    }
+                });
+            }
             
             // Position orphan nodes at the very top, above everything else
             const orphanRowY = 20; // Small margin from top edge
             const orphanNodes = [];
-            if (data.orphanNodes && data.orphanNodes.length > 0) {{
+            if (data.orphanNodes && data.orphanNodes.length > 0) {
                 // Create maps to track orphan sources
                 const orphanToSource = new Map();
                 
                 // Map conditional link targets to their source decision nodes
-                data.conditionalLinks.forEach(link => {{
-                    if (data.orphanNodes.some(orphan => orphan.id === link.targetId)) {{
+                data.conditionalLinks.forEach(link => {
+                    if (data.orphanNodes.some(orphan => orphan.id === link.targetId)) {
                         orphanToSource.set(link.targetId, link.sourceId);
-                    }}
-                }});
+                    }
+                });
                 
                 // Map orphan-to-orphan links
-                if (data.orphanLinks) {{
-                    data.orphanLinks.forEach(link => {{
+                if (data.orphanLinks) {
+                    data.orphanLinks.forEach(link => {
                         orphanToSource.set(link.targetId, link.sourceId);
-                    }});
-                }}
+                    });
+                }
                 
                 // Position orphans in order, ensuring each is to the right of its source
-                data.orphanNodes.forEach((orphan, i) => {{
+                data.orphanNodes.forEach((orphan, i) => {
                     // Find the source node for this orphan (could be a decision node or another orphan)
                     const sourceId = orphanToSource.get(orphan.id);
                     let sourceNode = nodeMap[sourceId];
                     
                     // If source not found yet in nodeMap, it might be an orphan we haven't positioned yet
                     // In that case, skip for now and we'll handle it in a second pass
-                    if (!sourceNode && sourceId) {{
+                    if (!sourceNode && sourceId) {
                         // Check if source is in orphanNodes (not yet positioned)
                         const sourceOrphan = data.orphanNodes.find(o => o.id === sourceId);
-                        if (sourceOrphan) {{
+                        if (sourceOrphan) {
                             // We'll handle this in order - for now just note we need proper ordering
                             // This shouldn't happen if orphanNodes are in chain order
-                        }}
-                    }}
+                        }
+                    }
                     
                     // Position to the right of the source node with additional offset
                     // Only add orphan if we have a valid source
-                    if (sourceNode) {{
+                    if (sourceNode) {
                         const xPos = sourceNode.x + horizontalSpacing + (horizontalSpacing / 2);
                         
-                        const orphanNode = {{
+                        const orphanNode = {
                             ...orphan,
                             x: xPos,
                             y: orphanRowY,
                             width: nodeWidth,
                             height: nodeHeight
-                        }};
+                        };
                         orphanNodes.push(orphanNode);
                         nodeMap[orphan.id] = orphanNode;
-                    }}
-                }});
-            }}
+                    }
+                });
+            }
             
             // Calculate SVG dimensions - add space for orphan nodes at top
             const svgWidth = Math.max(nodes.length, orphanNodes.length) * horizontalSpacing + marginLeft + marginRight;
@@ -338,59 +353,17 @@ class Timeline:
                 .attr("width", svgWidth)
                 .attr("height", svgHeight);
             
-            // Define arrowhead markers
-            const defs = svg.append("defs");
-            
-            // Black arrowhead for regular links
-            defs.append("marker")
-                .attr("id", `arrowhead-${{data.id}}`)
-                .attr("viewBox", "0 -5 10 10")
-                .attr("refX", 8)
-                .attr("refY", 0)
-                .attr("markerWidth", 6)
-                .attr("markerHeight", 6)
-                .attr("orient", "auto")
-                .append("path")
-                .attr("d", "M0,-5L10,0L0,5")
-                .attr("fill", "#000000");
-            
-            // Blue arrowhead for timing links
-            defs.append("marker")
-                .attr("id", `arrowhead-timing-${{data.id}}`)
-                .attr("viewBox", "0 -5 10 10")
-                .attr("refX", 8)
-                .attr("refY", 0)
-                .attr("markerWidth", 6)
-                .attr("markerHeight", 6)
-                .attr("orient", "auto")
-                .append("path")
-                .attr("d", "M0,-5L10,0L0,5")
-                .attr("fill", "#003366");
-            
-            // Black arrowhead for conditional links
-            defs.append("marker")
-                .attr("id", `arrowhead-conditional-${{data.id}}`)
-                .attr("viewBox", "0 -5 10 10")
-                .attr("refX", 8)
-                .attr("refY", 0)
-                .attr("markerWidth", 6)
-                .attr("markerHeight", 6)
-                .attr("orient", "auto")
-                .append("path")
-                .attr("d", "M0,-5L10,0L0,5")
-                .attr("fill", "#000000");
-            
             // Create links
             const links = [];
-            nodes.forEach((node, i) => {{
-                if (i < nodes.length - 1) {{
-                    links.push({{
+            nodes.forEach((node, i) => {
+                if (i < nodes.length - 1) {
+                    links.push({
                         source: node,
                         target: nodes[i + 1],
                         label: node.linkLabel || ""
-                    }});
-                }}
-            }});
+                    });
+                }
+            });
             
             // Draw links
             const linkGroup = svg.append("g").attr("class", "links");
@@ -399,45 +372,10 @@ class Timeline:
                 .data(links)
                 .join("path")
                 .attr("class", "link")
-                .attr("d", d => {{
-                    // Calculate connection points based on node type
-                    let sourceX, sourceY, targetX, targetY;
-                    
-                    // Source node
-                    if (d.source.type === 'activity') {{
-                        // For circles, connect from the right edge
-                        const radius = Math.min(d.source.width, d.source.height) / 2;
-                        sourceX = d.source.x + d.source.width / 2 + radius;
-                        sourceY = d.source.y + d.source.height / 2;
-                    }} else if (d.source.type === 'decision') {{
-                        // For diamonds, connect from the right point
-                        sourceX = d.source.x + d.source.width;
-                        sourceY = d.source.y + d.source.height / 2;
-                    }} else {{
-                        // For rectangles (entry/exit), connect from the right edge
-                        sourceX = d.source.x + d.source.width;
-                        sourceY = d.source.y + d.source.height / 2;
-                    }}
-                    
-                    // Target node
-                    if (d.target.type === 'activity') {{
-                        // For circles, connect to the left edge
-                        const radius = Math.min(d.target.width, d.target.height) / 2;
-                        targetX = d.target.x + d.target.width / 2 - radius;
-                        targetY = d.target.y + d.target.height / 2;
-                    }} else if (d.target.type === 'decision') {{
-                        // For diamonds, connect to the left point
-                        targetX = d.target.x;
-                        targetY = d.target.y + d.target.height / 2;
-                    }} else {{
-                        // For rectangles (entry/exit), connect to the left edge
-                        targetX = d.target.x;
-                        targetY = d.target.y + d.target.height / 2;
-                    }}
-                    
-                    return `M${{sourceX}},${{sourceY}} L${{targetX}},${{targetY}}`;
-                }})
-                .attr("marker-end", `url(#arrowhead-${{data.id}})`);
+                // Every node shape (circle, diamond, rectangle) meets the row at its
+                // right/left edge mid-height, so no per-type endpoint branching
+                .attr("d", d => `M${d.source.x + d.source.width},${d.source.y + d.source.height / 2} L${d.target.x},${d.target.y + d.target.height / 2}`)
+                .attr("marker-end", "url(#arrowhead)");
             
             // Draw link labels
             linkGroup.selectAll("text")
@@ -455,96 +393,60 @@ class Timeline:
             const nodeElements = nodeGroup.selectAll("g")
                 .data(nodes)
                 .join("g")
-                .attr("class", d => `node node-${{d.type}}`)
-                .attr("transform", d => `translate(${{d.x}},${{d.y}})`)
-                .on("mouseover", (event, d) => {{
+                .attr("class", d => `node node-${d.type}`)
+                .attr("transform", d => `translate(${d.x},${d.y})`)
+                .on("mouseover", (event, d) => {
                     const tooltipText = `
-                        <strong>${{d.label}}</strong><br/>
-                        Type: ${{d.type}}<br/>
-                        ${{d.description ? 'Description: ' + d.description : ''}}
+                        <strong>${d.label}</strong><br/>
+                        Type: ${d.type}<br/>
+                        ${d.description ? 'Description: ' + d.description : ''}
                     `;
                     showTooltip(event, tooltipText);
-                }})
+                })
                 .on("mouseout", hideTooltip);
             
             // Add shapes based on node type
-            nodeElements.each(function(d) {{
+            nodeElements.each(function(d) {
                 const node = d3.select(this);
                 
-                if (d.type === 'activity') {{
+                if (d.type === 'activity') {
                     // Activity nodes are circles
                     const radius = Math.min(d.width, d.height) / 2;
                     node.append("circle")
                         .attr("cx", d.width / 2)
                         .attr("cy", d.height / 2)
                         .attr("r", radius);
-                }} else if (d.type === 'decision') {{
+                } else if (d.type === 'decision') {
                     // Decision nodes are diamonds
                     const centerX = d.width / 2;
                     const centerY = d.height / 2;
-                    const diamondPath = `M ${{centerX}},${{0}} L ${{d.width}},${{centerY}} L ${{centerX}},${{d.height}} L ${{0}},${{centerY}} Z`;
+                    const diamondPath = `M ${centerX},${0} L ${d.width},${centerY} L ${centerX},${d.height} L ${0},${centerY} Z`;
                     node.append("path")
                         .attr("d", diamondPath);
-                }} else {{
+                } else {
                     // Entry and exit nodes are rectangles
                     node.append("rect")
                         .attr("width", d.width)
                         .attr("height", d.height);
-                }}
-            }});
+                }
+            });
             
-            // Add text labels (with wrapping)
-            nodeElements.each(function(d) {{
-                const node = d3.select(this);
-                const words = d.label.split(/\\s+/);
-                const lineHeight = 14;
-                const maxWidth = d.width - 10;
-                
-                let line = [];
-                let lineNumber = 0;
-                const text = node.append("text")
-                    .attr("x", d.width / 2)
-                    .attr("y", d.height / 2)
-                    .attr("text-anchor", "middle")
-                    .attr("dominant-baseline", "central");
-                
-                let tspan = text.append("tspan")
-                    .attr("x", d.width / 2)
-                    .attr("dy", 0);
-                
-                words.forEach((word, i) => {{
-                    line.push(word);
-                    const testLine = line.join(" ");
-                    tspan.text(testLine);
-                    
-                    if (tspan.node().getComputedTextLength() > maxWidth && line.length > 1) {{
-                        line.pop();
-                        tspan.text(line.join(" "));
-                        line = [word];
-                        tspan = text.append("tspan")
-                            .attr("x", d.width / 2)
-                            .attr("dy", lineHeight)
-                            .text(word);
-                    }}
-                }});
-                
-                // Center the text vertically
-                const bbox = text.node().getBBox();
-                const offset = (d.height - bbox.height) / 2 - bbox.y;
-                text.attr("transform", `translate(0, ${{offset}})`);
-            }});
+            // Add text labels, wrapped into lines by the generator
+            nodeElements.each(function(d) {
+                drawLabel(d3.select(this), d);
+            });
             
             // Draw timing links with arrows and labels
             const timingLinkGroup = svg.append("g").attr("class", "timing-links");
             
-            timingNodes.forEach(timing => {{
+            timingNodes.forEach(timing => {
                 // Line from "from" node to timing node (with arrow pointing UP at activity node)
                 const fromX = timing.fromNode.x + timing.fromNode.width / 2;
                 const fromY = timing.fromNode.y + timing.fromNode.height;
                 const fromPath = timingLinkGroup.append("path")
                     .attr("class", "link-timing")
-                    .attr("d", `M${{timing.x}},${{timing.y}} L${{fromX}},${{fromY}}`)
-                    .attr("marker-end", `url(#arrowhead-timing-${{data.id}})`);
+                    .attr("d", `M${timing.x},${timing.y} L${fromX},${fromY}`)
+                    .attr("marker-end", "url(#arrowhead-timing)");
                 
                 // Label for "from" link
                 const fromMidX = (timing.x + fromX) / 2;
@@ -564,8 +466,8 @@ class Timeline:
                 const toY = timing.toNode.y + timing.toNode.height;
                 const toPath = timingLinkGroup.append("path")
                     .attr("class", "link-timing")
-                    .attr("d", `M${{timing.x}},${{timing.y}} L${{toX}},${{toY}}`)
-                    .attr("marker-end", `url(#arrowhead-timing-${{data.id}})`);
+                    .attr("d", `M${timing.x},${timing.y} L${toX},${toY}`)
+                    .attr("marker-end", "url(#arrowhead-timing)");
                 
                 // Label for "to" link
                 const toMidX = (timing.x + toX) / 2;
@@ -579,7 +481,7 @@ class Timeline:
                     .style("font-size", "10px")
                     .style("font-weight", "bold")
                     .text("to");
-            }});
+            });
             
             // Draw timing nodes
             const timingNodeGroup = svg.append("g").attr("class", "timing-nodes");
@@ -588,16 +490,16 @@ class Timeline:
                 .data(timingNodes)
                 .join("g")
                 .attr("class", "node node-timing")
-                .attr("transform", d => `translate(${{d.x}},${{d.y}})`)
-                .on("mouseover", (event, d) => {{
+                .attr("transform", d => `translate(${d.x},${d.y})`)
+                .on("mouseover", (event, d) => {
                     const tooltipText = `
-                        <strong>${{d.label}}</strong><br/>
-                        Type: ${{d.type}}<br/>
-                        Value: ${{d.valueLabel}}<br/>
-                        ${{d.windowLabel ? 'Window: ' + d.windowLabel : ''}}
+                        <strong>${d.label}</strong><br/>
+                        Type: ${d.type}<br/>
+                        Value: ${d.valueLabel}<br/>
+                        ${d.windowLabel ? 'Window: ' + d.windowLabel : ''}
                     `;
                     showTooltip(event, tooltipText);
-                }})
+                })
                 .on("mouseout", hideTooltip);
             
             // Add circles for timing nodes
@@ -605,10 +507,10 @@ class Timeline:
                 .attr("r", d => d.radius);
             
             // Add text labels or anchor icon for timing nodes
-            timingElements.each(function(d) {{
+            timingElements.each(function(d) {
                 const node = d3.select(this);
                 
-                if (d.isAnchor) {{
+                if (d.isAnchor) {
                     // Draw ship's anchor icon matching the reference design
                     const anchorGroup = node.append("g")
                         .attr("transform", "scale(1.4)");
@@ -653,7 +555,7 @@ class Timeline:
                     anchorGroup.append("path")
                         .attr("d", rightFlukePath)
                         .attr("fill", "#003366");
-                }} else {{
+                } else {
                     // Draw text for non-anchor nodes
                     const text = node.append("text")
                         .attr("text-anchor", "middle")
@@ -662,26 +564,26 @@ class Timeline:
                     
                     // Create multi-line text
                     const lines = [d.label, d.type, d.valueLabel];
-                    if (d.windowLabel) {{
+                    if (d.windowLabel) {
                         lines.push(d.windowLabel);
-                    }}
+                    }
                     
-                    lines.forEach((line, i) => {{
+                    lines.forEach((line, i) => {
                         text.append("tspan")
                             .attr("x", 0)
                             .attr("dy", i === 0 ? 0 : 12)
                             .text(line);
-                    }});
+                    });
                     
                     // Center the text vertically
                     const bbox = text.node().getBBox();
                     const offset = -bbox.height / 2 - bbox.y;
-                    text.attr("transform", `translate(0, ${{offset}})`);
-                }}
-            }});
+                    text.attr("transform", `translate(0, ${offset})`);
+                }
+            });
             
             // Draw conditional links above the timeline
-            if (data.conditionalLinks && data.conditionalLinks.length > 0) {{
+            if (data.conditionalLinks && data.conditionalLinks.length > 0) {
                 const conditionalLinkGroup = svg.append("g").attr("class", "conditional-links");
                 
                 // Calculate height levels for each link to avoid overlaps
@@ -694,32 +596,32 @@ class Timeline:
                 const sourceNodeLinkCount = new Map();
                 
                 // Count links per source node
-                data.conditionalLinks.forEach(link => {{
+                data.conditionalLinks.forEach(link => {
                     const count = sourceNodeLinkCount.get(link.sourceId) || 0;
                     sourceNodeLinkCount.set(link.sourceId, count + 1);
-                }});
+                });
                 
                 // Assign heights based on source node position and link index
                 let currentSourceId = null;
                 let linkIndexForSource = 0;
-                data.conditionalLinks.forEach((link, idx) => {{
-                    if (link.sourceId !== currentSourceId) {{
+                data.conditionalLinks.forEach((link, idx) => {
+                    if (link.sourceId !== currentSourceId) {
                         currentSourceId = link.sourceId;
                         linkIndexForSource = 0;
-                    }}
+                    }
                     
                     // Calculate height level: use link index within source to stagger heights
                     const heightLevel = linkIndexForSource;
                     const height = baseHeight + (heightLevel * heightIncrement);
                     linkHeights.set(idx, height);
                     linkIndexForSource++;
-                }});
+                });
                 
-                data.conditionalLinks.forEach((link, idx) => {{
+                data.conditionalLinks.forEach((link, idx) => {
                     const sourceNode = nodeMap[link.sourceId];
                     const targetNode = nodeMap[link.targetId];
                     
-                    if (sourceNode && targetNode) {{
+                    if (sourceNode && targetNode) {
                         // Calculate start and end points
                         // From top of diamond (decision node)
                         const startX = sourceNode.x + sourceNode.width / 2;
@@ -730,29 +632,29 @@ class Timeline:
                         
                         // To center of target node (left side for orphans, top for regular nodes)
                         let endX, endY;
-                        if (isOrphanTarget) {{
+                        if (isOrphanTarget) {
                             // For orphan nodes, connect to the left center
-                            if (targetNode.type === 'activity') {{
+                            if (targetNode.type === 'activity') {
                                 const radius = Math.min(targetNode.width, targetNode.height) / 2;
                                 endX = targetNode.x + targetNode.width / 2 - radius;
                                 endY = targetNode.y + targetNode.height / 2;
-                            }} else {{
+                            } else {
                                 endX = targetNode.x;
                                 endY = targetNode.y + targetNode.height / 2;
-                            }}
-                        }} else {{
+                            }
+                        } else {
                             // For regular nodes, connect to the top
-                            if (targetNode.type === 'activity') {{
+                            if (targetNode.type === 'activity') {
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y + targetNode.height / 2 - Math.min(targetNode.width, targetNode.height) / 2;
-                            }} else if (targetNode.type === 'decision') {{
+                            } else if (targetNode.type === 'decision') {
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y;
-                            }} else {{
+                            } else {
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y;
-                            }}
-                        }}
+                            }
+                        }
                         
                         // Get assigned height for this link
                         // For orphan targets, use the orphan's Y position for horizontal segment
@@ -761,12 +663,12 @@ class Timeline:
                         
                         // Create orthogonal path: up, across, down
                         // Note: Must use separate segments to ensure all lines render
-                        const pathD = `M ${{startX}} ${{startY}} L ${{startX}} ${{horizontalY}} L ${{endX}} ${{horizontalY}} L ${{endX}} ${{endY}}`;
+                        const pathD = `M ${startX} ${startY} L ${startX} ${horizontalY} L ${endX} ${horizontalY} L ${endX} ${endY}`;
                         
                         conditionalLinkGroup.append("path")
                             .attr("class", "link-conditional")
                             .attr("d", pathD)
-                            .attr("marker-end", `url(#arrowhead-conditional-${{data.id}})`);
+                            .attr("marker-end", "url(#arrowhead-conditional)");
                         
                         // Add condition label at the midpoint of the horizontal segment
                         const midX = (startX + endX) / 2;
@@ -776,225 +678,295 @@ class Timeline:
                             .attr("y", horizontalY - 5)
                             .attr("text-anchor", "middle")
                             .text(link.condition);
-                    }}
-                }});
-            }}
+                    }
+                });
+            }
             
             // Draw orphan nodes
-            if (orphanNodes.length > 0) {{
+            if (orphanNodes.length > 0) {
                 const orphanNodeGroup = svg.append("g").attr("class", "orphan-nodes");
                 
                 const orphanNodeElements = orphanNodeGroup.selectAll("g")
                     .data(orphanNodes)
                     .join("g")
-                    .attr("class", d => `node node-${{d.type}}`)
-                    .attr("transform", d => `translate(${{d.x}},${{d.y}})`)
-                    .on("mouseover", (event, d) => {{
+                    .attr("class", d => `node node-${d.type}`)
+                    .attr("transform", d => `translate(${d.x},${d.y})`)
+                    .on("mouseover", (event, d) => {
                         const tooltipText = `
-                            <strong>${{d.label}}</strong><br/>
-                            Type: ${{d.type}}<br/>
-                            ${{d.description ? 'Description: ' + d.description : ''}}
+                            <strong>${d.label}</strong><br/>
+                            Type: ${d.type}<br/>
+                            ${d.description ? 'Description: ' + d.description : ''}
                         `;
                         showTooltip(event, tooltipText);
-                    }})
+                    })
                     .on("mouseout", hideTooltip);
                 
                 // Add shapes for orphan nodes
-                orphanNodeElements.each(function(d) {{
+                orphanNodeElements.each(function(d) {
                     const node = d3.select(this);
                     
-                    if (d.type === 'activity') {{
+                    if (d.type === 'activity') {
                         const radius = Math.min(d.width, d.height) / 2;
                         node.append("circle")
                             .attr("cx", d.width / 2)
                             .attr("cy", d.height / 2)
                             .attr("r", radius);
-                    }} else if (d.type === 'decision') {{
+                    } else if (d.type === 'decision') {
                         const centerX = d.width / 2;
                         const centerY = d.height / 2;
-                        const diamondPath = `M ${{centerX}},${{0}} L ${{d.width}},${{centerY}} L ${{centerX}},${{d.height}} L ${{0}},${{centerY}} Z`;
+                        const diamondPath = `M ${centerX},${0} L ${d.width},${centerY} L ${centerX},${d.height} L ${0},${centerY} Z`;
                         node.append("path")
                             .attr("d", diamondPath);
-                    }} else {{
+                    } else {
                         node.append("rect")
                             .attr("width", d.width)
                             .attr("height", d.height);
-                    }}
-                }});
+                    }
+                });
                 
                 // Add text labels for orphan nodes
-                orphanNodeElements.each(function(d) {{
-                    const node = d3.select(this);
-                    const words = d.label.split(/\\s+/);
-                    const lineHeight = 14;
-                    const maxWidth = d.width - 10;
-                    
-                    let line = [];
-                    const text = node.append("text")
-                        .attr("x", d.width / 2)
-                        .attr("y", d.height / 2)
-                        .attr("text-anchor", "middle")
-                        .attr("dominant-baseline", "central");
-                    
-                    let tspan = text.append("tspan")
-                        .attr("x", d.width / 2)
-                        .attr("dy", 0);
-                    
-                    words.forEach((word, i) => {{
-                        line.push(word);
-                        const testLine = line.join(" ");
-                        tspan.text(testLine);
-                        
-                        if (tspan.node().getComputedTextLength() > maxWidth && line.length > 1) {{
-                            line.pop();
-                            tspan.text(line.join(" "));
-                            line = [word];
-                            tspan = text.append("tspan")
-                                .attr("x", d.width / 2)
-                                .attr("dy", lineHeight)
-                                .text(word);
-                        }}
-                    }});
-                    
-                    const bbox = text.node().getBBox();
-                    const offset = (d.height - bbox.height) / 2 - bbox.y;
-                    text.attr("transform", `translate(0, ${{offset}})`);
-                }});
+                orphanNodeElements.each(function(d) {
+                    drawLabel(d3.select(this), d);
+                });
                 
                 // Draw links between orphan nodes
-                if (data.orphanLinks && data.orphanLinks.length > 0) {{
+                if (data.orphanLinks && data.orphanLinks.length > 0) {
                     const orphanLinkGroup = svg.append("g").attr("class", "orphan-links");
                     
-                    data.orphanLinks.forEach(link => {{
+                    data.orphanLinks.forEach(link => {
                         const sourceNode = nodeMap[link.sourceId];
                         const targetNode = nodeMap[link.targetId];
                         
-                        if (sourceNode && targetNode) {{
+                        if (sourceNode && targetNode) {
                             let sourceX, sourceY, targetX, targetY;
                             
-                            if (sourceNode.type === 'activity') {{
+                            if (sourceNode.type === 'activity') {
                                 const radius = Math.min(sourceNode.width, sourceNode.height) / 2;
                                 sourceX = sourceNode.x + sourceNode.width / 2 + radius;
                                 sourceY = sourceNode.y + sourceNode.height / 2;
-                            }} else if (sourceNode.type === 'decision') {{
+                            } else if (sourceNode.type === 'decision') {
                                 sourceX = sourceNode.x + sourceNode.width;
                                 sourceY = sourceNode.y + sourceNode.height / 2;
-                            }} else {{
+                            } else {
                                 sourceX = sourceNode.x + sourceNode.width;
                                 sourceY = sourceNode.y + sourceNode.height / 2;
-                            }}
+                            }
                             
-                            if (targetNode.type === 'activity') {{
+                            if (targetNode.type === 'activity') {
                                 const radius = Math.min(targetNode.width, targetNode.height) / 2;
                                 targetX = targetNode.x + targetNode.width / 2 - radius;
                                 targetY = targetNode.y + targetNode.height / 2;
-                            }} else if (targetNode.type === 'decision') {{
+                            } else if (targetNode.type === 'decision') {
                                 targetX = targetNode.x;
                                 targetY = targetNode.y + targetNode.height / 2;
-                            }} else {{
+                            } else {
                                 targetX = targetNode.x;
                                 targetY = targetNode.y + targetNode.height / 2;
-                            }}
+                            }
                             
                             orphanLinkGroup.append("path")
                                 .attr("class", "link")
-                                .attr("d", `M${{sourceX}},${{sourceY}} L${{targetX}},${{targetY}}`)
-                                .attr("marker-end", `url(#arrowhead-${{data.id}})`);
-                        }}
-                    }});
-                }}
+                                .attr("d", `M${sourceX},${sourceY} L${targetX},${targetY}`)
+                                .attr("marker-end", "url(#arrowhead)");
+                        }
+                    });
+                }
                 
                 // Draw links from orphan nodes back to main timeline
-                if (data.orphanToMainLinks && data.orphanToMainLinks.length > 0) {{
+                if (data.orphanToMainLinks && data.orphanToMainLinks.length > 0) {
                     const orphanToMainLinkGroup = svg.append("g").attr("class", "orphan-to-main-links");
                     
-                    data.orphanToMainLinks.forEach(link => {{
+                    data.orphanToMainLinks.forEach(link => {
                         const sourceNode = nodeMap[link.sourceId];
                         const targetNode = nodeMap[link.targetId];
                         
-                        if (sourceNode && targetNode) {{
+                        if (sourceNode && targetNode) {
                             // Start from bottom of orphan node
                             let startX, startY;
-                            if (sourceNode.type === 'activity') {{
+                            if (sourceNode.type === 'activity') {
                                 const radius = Math.min(sourceNode.width, sourceNode.height) / 2;
                                 startX = sourceNode.x + sourceNode.width / 2;
                                 startY = sourceNode.y + sourceNode.height / 2 + radius;
-                            }} else if (sourceNode.type === 'decision') {{
+                            } else if (sourceNode.type === 'decision') {
                                 startX = sourceNode.x + sourceNode.width / 2;
                                 startY = sourceNode.y + sourceNode.height;
-                            }} else {{
+                            } else {
                                 startX = sourceNode.x + sourceNode.width / 2;
                                 startY = sourceNode.y + sourceNode.height;
-                            }}
+                            }
                             
                             // End at top of target node on main timeline
                             let endX, endY;
-                            if (targetNode.type === 'activity') {{
+                            if (targetNode.type === 'activity') {
                                 const radius = Math.min(targetNode.width, targetNode.height) / 2;
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y + targetNode.height / 2 - radius;
-                            }} else if (targetNode.type === 'decision') {{
+                            } else if (targetNode.type === 'decision') {
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y;
-                            }} else {{
+                            } else {
                                 endX = targetNode.x + targetNode.width / 2;
                                 endY = targetNode.y;
-                            }}
+                            }
                             
                             // Calculate intermediate Y for horizontal segment (midpoint between source and target)
                             const midY = (startY + endY) / 2;
                             
                             // Create orthogonal path: down, across, down
-                            const pathD = `M ${{startX}} ${{startY}} L ${{startX}} ${{midY}} L ${{endX}} ${{midY}} L ${{endX}} ${{endY}}`;
+                            const pathD = `M ${startX} ${startY} L ${startX} ${midY} L ${endX} ${midY} L ${endX} ${endY}`;
                             
                             orphanToMainLinkGroup.append("path")
                                 .attr("class", "link")
                                 .attr("d", pathD)
-                                .attr("marker-end", `url(#arrowhead-${{data.id}})`);
-                        }}
-                    }});
-                }}
-            }}
+                                .attr("marker-end", "url(#arrowhead)");
+                        }
+                    });
+                }
+            }
             
-        }}
-    </script>
-</body>
-</html>"""
-        return html
+        }
+"""
+
+_CSS_FILE = "timeline_d3.css"
+_SCRIPT_FILE = "timeline_d3.js"
+
+# Page either side of the embedded timelines JSON payload, inline and linked
+_HTML_HEAD = (
+    _PAGE_START
+    + "    <style>\n"
+    + _CSS
+    + "    </style>\n"
+    + _BODY_START
+    + "    <script>\n        const timelinesData = "
+)
+_HTML_TAIL = ";\n" + _SCRIPT + "    </script>\n</body>\n</html>"
+
+_LINKED_HTML_HEAD = (
+    _PAGE_START
+    + f'    <link rel="stylesheet" href="{_CSS_FILE}">\n'
+    + _BODY_START
+    + "    <script>\n        const timelinesData = "
+)
+_LINKED_HTML_TAIL = (
+    f';\n    </script>\n    <script src="{_SCRIPT_FILE}"></script>\n</body>\n</html>'
+)
+
+def _wrap_label(label):
+    """Break a node label into lines, long single words are kept whole."""
+    return wrap(
+        label or "",
+        _LABEL_LINE_CHARS,
+        break_long_words=False,
+        break_on_hyphens=False,
+    )
+
+
+class Timeline:
+    def __init__(self, file_path: str, errors: Errors):
+        self._errors = errors
+        self._usdm = USDM4()
+        self._file_path = file_path
+        self._builder: Builder = self._usdm.builder(errors)
+        # Validated wrapper and the (path, mtime) it was loaded from
+        self._wrapper: Wrapper | None = None
+        self._wrapper_key = None
+
+    def to_html(self):
+        """Generate HTML with D3 visualization for all timelines."""
+        wrapper = self._load()
+
+        try:
+            study_design = wrapper.study.versions[0].studyDesigns[0]
+            return "".join(self._generate_html(study_design))
+        except Exception as e:
+            self._errors.exception(f"Failed generating HTML page", e)
+            return ""
+
+    def to_file(self, file_path: str, linked: bool = False) -> bool:
+        """As to_html but the page is written piecewise rather than built in memory.
+
+        With linked set the CSS and script go to shared files alongside the
+        page, rewritten only when their content has changed.
+        """
+        wrapper = self._load()
+
+        try:
+            study_design = wrapper.study.versions[0].studyDesigns[0]
+            if linked:
+                save_assets(os.path.dirname(file_path))
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.writelines(self._generate_html(study_design, linked))
+            return True
+        except Exception as e:
+            self._errors.exception(f"Failed writing HTML page", e)
+            return False
+
+    def _load(self) -> Wrapper:
+        # Repeat calls reuse the validated wrapper unless the file has changed
+        key = (self._file_path, os.path.getmtime(self._file_path))
+        if key == self._wrapper_key:
+            return self._wrapper
+        self._builder.seed(self._file_path)
+        self._data_store: DataStore = self._builder._data_store
+        # instance_by_id is already a dict lookup in the DataStore, so it is
+        # bound once here rather than memoised in front of another dict
+        self._xref = self._data_store.instance_by_id
+        wrapper_dict: dict = self._data_store.data
+        wrapper_dict["study"]["id"] = uuid4()
+        self._wrapper = Wrapper.model_validate(wrapper_dict)
+        self._wrapper_key = key
+        return self._wrapper
+
+    def _generate_html(self, study_design: StudyDesign, linked: bool = False):
+        """Generate complete HTML with embedded D3 visualization."""
+
+        # Collect all timeline data
+        timelines_data = []
+        for timeline in study_design.scheduleTimelines:
+            timeline_data = self._process_timeline(timeline)
+            if timeline_data:
+                timelines_data.append(timeline_data)
+
+        # Generate HTML, the static head and tail either side of the JSON payload
+        yield _LINKED_HTML_HEAD if linked else _HTML_HEAD
+        yield self._format_timelines_data(timelines_data)
+        yield _LINKED_HTML_TAIL if linked else _HTML_TAIL
 
     def _process_timeline(self, timeline):
         """Process a timeline and extract node data."""
         try:
+            # Local alias for the store lookup, the per-hop cost of both walks
+            xref = self._xref
             nodes = []
 
-            # Get the entry instance
-            instance = self._get_cross_reference(timeline.entryId)
-            if not instance:
+            # Collect all instances in order - first pass for main timeline
+            chain = self._main_chain(timeline.entryId)
+            if not chain:
                 return None
 
-            # Collect all instances in order - first pass for main timeline
             conditional_links = []
             main_timeline_node_ids = set()
 
-            while instance:
-                # Determine the node type
-                if instance["instanceType"] == ScheduledActivityInstance.__name__:
+            for index, instance in enumerate(chain):
+                # Determine the node type, overridden for the entry (first) node
+                if index == 0:
+                    node_type = "entry"
+                elif instance["instanceType"] == _ACTIVITY_INSTANCE:
                     node_type = "activity"
-                elif instance["instanceType"] == ScheduledDecisionInstance.__name__:
+                elif instance["instanceType"] == _DECISION_INSTANCE:
                     node_type = "decision"
                 else:
                     node_type = "unknown"
 
-                # Override type for entry node (first node)
-                if len(nodes) == 0:
-                    node_type = "entry"
-
+                label = instance.get("label", instance.get("name", "Unknown"))
                 node_data = {
                     "id": instance["id"],
-                    "label": instance.get("label", instance.get("name", "Unknown")),
-                    "description": instance.get("description", ""),
+                    "label": label,
+                    "lines": _wrap_label(label),
                     "type": node_type,
                 }
+                if description := instance.get("description"):
+                    node_data["description"] = description
 
                 # Extract condition assignments for decision nodes
                 if node_type == "decision" and "conditionAssignments" in instance:
@@ -1010,25 +982,21 @@ class Timeline:
                 nodes.append(node_data)
                 main_timeline_node_ids.add(instance["id"])
 
-                # Get next instance
-                next_id = instance.get("defaultConditionId")
-                if next_id:
-                    instance = self._get_cross_reference(next_id)
-                else:
-                    # This is the last instance, check for exit
-                    exit_id = instance.get("timelineExitId")
-                    if exit_id:
-                        exit_obj = self._get_cross_reference(exit_id)
-                        if exit_obj:
-                            nodes.append(
-                                {
-                                    "id": exit_obj["id"],
-                                    "label": "Exit",
-                                    "description": "Timeline Exit",
-                                    "type": "exit",
-                                }
-                            )
-                    instance = None
+            # If the chain ended at its last instance, check for exit
+            last = chain[-1]
+            exit_id = last.get("timelineExitId")
+            if not last.get("defaultConditionId") and exit_id:
+                exit_obj = xref(exit_id)
+                if exit_obj:
+                    nodes.append(
+                        {
+                            "id": exit_obj["id"],
+                            "label": "Exit",
+                            "lines": ["Exit"],
+                            "description": "Timeline Exit",
+                            "type": "exit",
+                        }
+                    )
 
             # Second pass: collect orphan nodes (nodes referenced by conditional links but not in main timeline)
             orphan_nodes = []
@@ -1043,7 +1011,7 @@ class Timeline:
                     and target_id not in processed_orphan_ids
                 ):
                     # This is an orphan node - follow its chain
-                    orphan_instance = self._get_cross_reference(target_id)
+                    orphan_instance = xref(target_id)
                     while (
                         orphan_instance
                         and orphan_instance["id"] not in main_timeline_node_ids
@@ -1052,27 +1020,24 @@ class Timeline:
                             break
 
                         # Determine node type
-                        if (
-                            orphan_instance["instanceType"]
-                            == ScheduledActivityInstance.__name__
-                        ):
+                        if orphan_instance["instanceType"] == _ACTIVITY_INSTANCE:
                             orphan_type = "activity"
-                        elif (
-                            orphan_instance["instanceType"]
-                            == ScheduledDecisionInstance.__name__
-                        ):
+                        elif orphan_instance["instanceType"] == _DECISION_INSTANCE:
                             orphan_type = "decision"
                         else:
                             orphan_type = "unknown"
 
+                        orphan_label = orphan_instance.get(
+                            "label", orphan_instance.get("name", "Unknown")
+                        )
                         orphan_node_data = {
                             "id": orphan_instance["id"],
-                            "label": orphan_instance.get(
-                                "label", orphan_instance.get("name", "Unknown")
-                            ),
-                            "description": orphan_instance.get("description", ""),
+                            "label": orphan_label,
+                            "lines": _wrap_label(orphan_label),
                             "type": orphan_type,
                         }
+                        if description := orphan_instance.get("description"):
+                            orphan_node_data["description"] = description
                         orphan_nodes.append(orphan_node_data)
                         processed_orphan_ids.add(orphan_instance["id"])
 
@@ -1087,7 +1052,7 @@ class Timeline:
                                         "targetId": next_id,
                                     }
                                 )
-                                orphan_instance = self._get_cross_reference(next_id)
+                                orphan_instance = xref(next_id)
                             else:
                                 # Link back to main timeline
                                 orphan_to_main_links.append(
@@ -1101,28 +1066,7 @@ class Timeline:
                             break
 
             # Process timings
-            timings = []
-            for timing in timeline.timings:
-                # Check if this is an anchor node (Fixed Reference type)
-                is_anchor = timing.type and timing.type.code == "C201358"
-
-                timing_data = {
-                    "id": timing.id,
-                    "label": timing.label,
-                    "type": timing.type.decode if timing.type else "Unknown",
-                    "typeCode": timing.type.code if timing.type else "",
-                    "isAnchor": is_anchor,
-                    "value": timing.value,
-                    "valueLabel": timing.valueLabel
-                    if timing.valueLabel
-                    else timing.value,
-                    "windowLower": timing.windowLower if timing.windowLower else "",
-                    "windowUpper": timing.windowUpper if timing.windowUpper else "",
-                    "windowLabel": timing.windowLabel if timing.windowLabel else "",
-                    "relativeFromScheduledInstanceId": timing.relativeFromScheduledInstanceId,
-                    "relativeToScheduledInstanceId": timing.relativeToScheduledInstanceId,
-                }
-                timings.append(timing_data)
+            timings = [self._timing_data(timing) for timing in timeline.timings]
 
             return {
                 "id": timeline.id,
@@ -1139,21 +1083,71 @@ class Timeline:
             self._errors.exception(f"Failed processing timeline {timeline.label}", e)
             return None
 
+    def _main_chain(self, entry_id):
+        """Follow defaultConditionId from the entry, returning instances in order."""
+        xref = self._xref
+        chain = []
+        instance = xref(entry_id)
+        while instance:
+            chain.append(instance)
+            next_id = instance.get("defaultConditionId")
+            instance = xref(next_id) if next_id else None
+        return chain
+
+    def _timing_data(self, timing):
+        """Extract the display data for a single timing."""
+        # Check if this is an anchor node (Fixed Reference type)
+        timing_type = timing.type
+        is_anchor = timing_type and timing_type.code == "C201358"
+
+        timing_data = {
+            "id": timing.id,
+            "label": timing.label,
+            "type": timing_type.decode if timing_type else "Unknown",
+            "typeCode": timing_type.code if timing_type else "",
+            "isAnchor": is_anchor,
+            "value": timing.value,
+            "valueLabel": timing.valueLabel or timing.value,
+            "relativeFromScheduledInstanceId": timing.relativeFromScheduledInstanceId,
+            "relativeToScheduledInstanceId": timing.relativeToScheduledInstanceId,
+        }
+        # Empty window fields are left out, the page treats a missing key as blank
+        for key in ("windowLower", "windowUpper", "windowLabel"):
+            if value := getattr(timing, key):
+                timing_data[key] = value
+        return timing_data
+
     def _format_timelines_data(self, timelines_data):
         """Format timeline data as JSON for embedding in HTML."""
-        return json.dumps(timelines_data)
+        if orjson is not None:
+            return orjson.dumps(timelines_data).decode("utf-8")
+        return json.dumps(timelines_data, separators=(",", ":"))
 
     def _get_cross_reference(self, id):
         """Get cross reference by ID."""
-        return self._builder._data_store.instance_by_id(id)
+        return self._xref(id)
 
 
 def save_html(file_path, result):
     """Save HTML content to file."""
-    with open(file_path, "w") as f:
+    with open(file_path, "w", encoding="utf-8") as f:
         f.write(result)
 
 
+def save_assets(dir_path):
+    """Write the shared CSS and script files used by linked pages."""
+    for name, text in ((_CSS_FILE, _CSS), (_SCRIPT_FILE, _SCRIPT)):
+        path = os.path.join(dir_path, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                if f.read() == text:
+                    continue
+        except FileNotFoundError:
+            pass
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         prog="USDM D3 Timeline Program",
@@ -1161,6 +1155,11 @@ if __name__ == "__main__":
         epilog="Creates a single HTML file with all timelines",
     )
     parser.add_argument("filename", help="The name of the USDM JSON file.")
+    parser.add_argument(
+        "--linked",
+        action="store_true",
+        help=f"Link the CSS and script from shared {_CSS_FILE} and {_SCRIPT_FILE} files written next to the output.",
+    )
     args = parser.parse_args()
     filename = args.filename
 
@@ -1178,12 +1177,11 @@ if __name__ == "__main__":
 
     errors = Errors()
     timeline = Timeline(full_filename, errors)
-    html = timeline.to_html()
+    saved = timeline.to_file(full_output_filename, args.linked)
 
-    if errors.error_count() > 0:
+    if not saved or errors.error_count() > 0:
         print(f"Errors: {errors.dump(0)}")
     else:
-        save_html(full_output_filename, html)
         print(f"Successfully created: {full_output_filename}")
         print("")
         print("Open this file in your browser to view the timeline visualization.")
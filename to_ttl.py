@@ -2,46 +2,156 @@
 """Convert RDF/XML file to Turtle (.ttl) format."""
 
 import argparse
+import glob
 import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from rdflib import Graph
 
+try:
+    import pyoxigraph
+except ImportError:
+    pyoxigraph = None
 
-def convert_rdf_to_ttl(input_path: str, output_path: str | None = None) -> None:
+# Prefixes rdflib binds by default, so both converters can abbreviate them
+_CORE_PREFIXES = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+    'xsd': 'http://www.w3.org/2001/XMLSchema#',
+    'owl': 'http://www.w3.org/2002/07/owl#',
+}
+
+
+def convert_rdf_to_ttl(
+    input_path: str, output_path: str | None = None, use_oxigraph: bool = False
+) -> None:
     """Convert an RDF/XML file to Turtle format.
 
     Args:
         input_path: Path to the input RDF/XML file.
         output_path: Path for the output .ttl file. If None, derives from input.
+        use_oxigraph: Convert with pyoxigraph instead of rdflib. Faster, but
+            the Turtle is laid out differently.
+
+    Raises:
+        FileNotFoundError: If the input file does not exist.
     """
     input_file = Path(input_path)
 
     if not input_file.exists():
-        print(f"Error: Input file '{input_path}' not found.", file=sys.stderr)
-        sys.exit(1)
+        raise FileNotFoundError(f"Input file '{input_path}' not found.")
 
     if output_path is None:
         output_file = input_file.with_suffix('.ttl')
     else:
         output_file = Path(output_path)
 
-    g = Graph()
-    g.parse(input_file, format='xml')
-    g.serialize(destination=output_file, format='turtle')
+    if not use_oxigraph or not _convert_with_oxigraph(input_file, output_file):
+        g = Graph()
+        g.parse(input_file, format='xml')
+        g.serialize(destination=output_file, format='turtle')
 
     print(f"Converted '{input_file}' to '{output_file}'")
 
 
+def _convert_with_oxigraph(input_file: Path, output_file: Path) -> bool:
+    """Convert using pyoxigraph's native parser and serializer.
+
+    The parser yields triples lazily and the serializer consumes them as they
+    arrive, so neither the input nor a graph is ever held in memory. The
+    namespace prefixes are collected up front, as the writer needs them
+    before the first triple.
+
+    Returns False if pyoxigraph rejects the input, so the caller can fall
+    back to rdflib, which is more forgiving of quirky RDF/XML.
+    """
+    try:
+        prefixes = _namespace_prefixes(input_file)
+        quads = pyoxigraph.parse(
+            path=str(input_file), format=pyoxigraph.RdfFormat.RDF_XML
+        )
+        with open(output_file, 'wb') as out:
+            pyoxigraph.serialize(
+                (quad.triple for quad in quads),
+                out,
+                format=pyoxigraph.RdfFormat.TURTLE,
+                prefixes=prefixes,
+            )
+    except (SyntaxError, ValueError, OSError, ET.ParseError):
+        # Don't leave a partial file behind if the fallback also fails
+        output_file.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _namespace_prefixes(input_file: Path) -> dict[str, str]:
+    """Return the prefixes declared anywhere in an RDF/XML file.
+
+    Only the namespace declarations are scanned, so this is cheap compared
+    with the parse itself. The core prefixes rdflib binds are added unless
+    the document maps those names or namespaces itself.
+    """
+    prefixes = {}
+    for _, (prefix, uri) in ET.iterparse(input_file, events=('start-ns',)):
+        prefixes.setdefault(prefix, uri)
+    namespaces = set(prefixes.values())
+    for prefix, uri in _CORE_PREFIXES.items():
+        if prefix not in prefixes and uri not in namespaces:
+            prefixes[prefix] = uri
+    return prefixes
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert RDF/XML file to Turtle (.ttl) format.'
     )
-    parser.add_argument('input', help='Input RDF/XML file')
-    parser.add_argument('-o', '--output', help='Output .ttl file (default: same name with .ttl extension)')
+    parser.add_argument('input', nargs='+', help='Input RDF/XML file(s) or glob patterns')
+    parser.add_argument('-o', '--output', help='Output .ttl file for a single input (default: same name with .ttl extension)')
+    parser.add_argument('-j', '--jobs', type=int, help='Worker processes for multiple inputs (default: CPU count)')
+    parser.add_argument('--oxigraph', action='store_true', help='Convert with pyoxigraph (faster, different Turtle layout)')
 
     args = parser.parse_args()
-    convert_rdf_to_ttl(args.input, args.output)
+    if args.oxigraph and pyoxigraph is None:
+        parser.error('--oxigraph requires pyoxigraph to be installed')
+    # Patterns that match nothing are kept so the missing file is reported
+    paths = [p for pattern in args.input for p in sorted(glob.glob(pattern)) or [pattern]]
+    if args.output and len(paths) > 1:
+        parser.error('--output can only be used with a single input file')
+
+    convert = partial(_convert_one, output_path=args.output, use_oxigraph=args.oxigraph)
+    if len(paths) == 1:
+        errors = [convert(paths[0])]
+    else:
+        # Conversion is CPU bound, so spread files over processes
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            errors = list(executor.map(convert, paths))
+
+    # One bad file doesn't stop the batch, but still fails the run
+    failed = [error for error in errors if error is not None]
+    for error in failed:
+        print(f"Error: {error}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+def _convert_one(
+    input_path: str, output_path: str | None, use_oxigraph: bool
+) -> str | None:
+    """Convert a file, returning an error message instead of raising.
+
+    Runs in worker processes, so the failure comes back as a plain string;
+    not every parser exception survives pickling.
+    """
+    try:
+        convert_rdf_to_ttl(input_path, output_path, use_oxigraph)
+    except FileNotFoundError as e:
+        return str(e)
+    except Exception as e:
+        return f"Could not convert '{input_path}': {e}"
+    return None
 
 
 if __name__ == '__main__':
@@ -1,141 +1,20 @@
 import os
 import argparse
 import warnings
+from operator import itemgetter
 from bs4 import BeautifulSoup
-from yattag import Doc
 from usdm4 import USDM4
 from usdm4.builder.builder import Builder, DataStore
 from simple_error_log.errors import Errors
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class Visit:
-    def __init__(self, file_path: str, errors: Errors):
-        self._errors = errors
-        self._usdm = USDM4()
-        self._file_path = file_path
-        self._builder: Builder = self._usdm.builder(errors)
 
-    def to_html(self, visit_id: str) -> str:
-        try:
-            self._builder.seed(self._file_path)
-            label, visit_data = self._visit_data(visit_id)
-            return self._generate_html(label, visit_data)
-        except Exception as e:
-            self._errors.exception(f"Failed generating HTML page", e)
-            return ""
-
-    def _visit_data(self, visit_id: str) -> tuple[str, dict]:
-        results = {}
-        label = "Not Found"
-        self._data_store: DataStore = self._builder._data_store
-        encounter = next(
-            (
-                x
-                for x in self._data_store.instances_by_klass("Encounter")
-                if x["id"] == visit_id
-            ),
-            None,
-        )
-        if encounter:
-            label = encounter["label"]
-            timepoint = next(
-                (
-                    x
-                    for x in self._data_store.instances_by_klass(
-                        "ScheduledActivityInstance"
-                    )
-                    if x["encounterId"] == encounter["id"]
-                ),
-                None,
-            )
-            if timepoint:
-                for id in timepoint["activityIds"]:
-                    activity = self._data_store.instance_by_id(id)
-                    key = activity["label"]
-                    if key not in results:
-                        if activity["label"].startswith("Inclusion"):
-                            results["Inclusion Criteria"] = []
-                            results["Exclusion Criteria"] = []
-                            for ec in self._data_store.instances_by_klass(
-                                "EligibilityCriterion"
-                            ):
-                                eci = self._data_store.instance_by_id(
-                                    ec["criterionItemId"]
-                                )
-                                translated_text = self._translate_references(
-                                    eci, eci["text"]
-                                )
-                                if ec["category"]["code"] == "C25532":
-                                    checkbox_html = """
-                                    <div class="d-flex align-items-start gap-3">
-                                        <div class="flex-grow-1">
-                                            <strong>IN{identifier}:</strong> {text}
-                                        </div>
-                                        <div class="btn-group btn-group-sm" role="group">
-                                            <input type="checkbox" class="btn-check" id="in{identifier}-yes" autocomplete="off">
-                                            <label class="btn btn-outline-success" for="in{identifier}-yes">
-                                                <i class="bi bi-check-lg"></i> Yes
-                                            </label>
-                                            <input type="checkbox" class="btn-check" id="in{identifier}-no" autocomplete="off">
-                                            <label class="btn btn-outline-danger" for="in{identifier}-no">
-                                                <i class="bi bi-x-lg"></i> No
-                                            </label>
-                                        </div>
-                                    </div>
-                                    """.format(
-                                        identifier=ec["identifier"],
-                                        text=str(translated_text),
-                                    )
-                                    results["Inclusion Criteria"].append(checkbox_html)
-                                if ec["category"]["code"] == "C25370":
-                                    checkbox_html = """
-                                    <div class="d-flex align-items-start gap-3">
-                                        <div class="flex-grow-1">
-                                            <strong>EX{identifier}:</strong> {text}
-                                        </div>
-                                        <div class="btn-group btn-group-sm" role="group">
-                                            <input type="checkbox" class="btn-check" id="ex{identifier}-yes" autocomplete="off">
-                                            <label class="btn btn-outline-success" for="ex{identifier}-yes">
-                                                <i class="bi bi-check-lg"></i> Yes
-                                            </label>
-                                            <input type="checkbox" class="btn-check" id="ex{identifier}-no" autocomplete="off">
-                                            <label class="btn btn-outline-danger" for="ex{identifier}-no">
-                                                <i class="bi bi-x-lg"></i> No
-                                            </label>
-                                        </div>
-                                    </div>
-                                    """.format(
-                                        identifier=ec["identifier"],
-                                        text=translated_text,
-                                    )
-                                    results["Exclusion Criteria"].append(checkbox_html)
-                        else:
-                            results[key] = []
-
-        for k, v in results.items():
-            if not v:
-                v.append("Some instructions here ...")
-        return label, results
-
-    def _generate_html(self, label: str, data: dict):
-        doc = Doc()
-        with doc.tag(f"div", klass="container-fluid px-4"):
-            with doc.tag(f"div", klass="row g-3"):
-                for k, v in data.items():
-                    with doc.tag(f"div", klass="col-12"):
-                        with doc.tag(f"div", klass="card shadow-sm border-0"):
-                            with doc.tag(
-                                f"div", klass="card-header bg-primary text-white py-2"
-                            ):
-                                with doc.tag(f"h5", klass="mb-0"):
-                                    doc.asis(f"{k}")
-                            with doc.tag(f"div", klass="card-body p-3"):
-                                for item in v:
-                                    with doc.tag(f"p", klass="card-text mb-2 small"):
-                                        doc.asis(f"{item}")
-
-        # Generate HTML
-        html = f"""<!DOCTYPE html>
+# Page shell, formatted with the visit label and the card body (CSS braces doubled)
+_HTML_PAGE = """<!DOCTYPE html>
             <html lang="en">
                 <head>
                     <meta charset="UTF-8">
@@ -181,14 +60,149 @@ class Visit:
                             </div>
                         </div>
                     </div>
-                    {doc.getvalue()}
+                    {body}
                     <div class="container-fluid px-4 py-3">
                         <small class="text-muted">Generated with USDM4 Utility</small>
                     </div>
                 </body>
             </html>
         """
-        return html
+
+
+# Body layout, one card per activity holding one paragraph per item
+_BODY = '<div class="container-fluid px-4"><div class="row g-3">{cards}</div></div>'
+_CARD = (
+    '<div class="col-12"><div class="card shadow-sm border-0">'
+    '<div class="card-header bg-primary text-white py-2">'
+    '<h5 class="mb-0">{title}</h5></div><div class="card-body p-3">{items}</div>'
+    "</div></div>"
+)
+_ITEM = '<p class="card-text mb-2 small">{}</p>'
+
+# Card content shown for activities with nothing else to list
+_PLACEHOLDER = ("Some instructions here ...",)
+
+# Identifier and criterion item id of an EligibilityCriterion in one call
+_criterion_keys = itemgetter("identifier", "criterionItemId")
+
+
+def _criterion_html(prefix: str, identifier: str, text: str) -> str:
+    """Criterion with Yes/No toggle buttons, prefix is either IN or EX."""
+    key = f"{prefix.lower()}{identifier}"
+    return f"""
+        <div class="d-flex align-items-start gap-3">
+            <div class="flex-grow-1">
+                <strong>{prefix}{identifier}:</strong> {text}
+            </div>
+            <div class="btn-group btn-group-sm" role="group">
+                <input type="checkbox" class="btn-check" id="{key}-yes" autocomplete="off">
+                <label class="btn btn-outline-success" for="{key}-yes">
+                    <i class="bi bi-check-lg"></i> Yes
+                </label>
+                <input type="checkbox" class="btn-check" id="{key}-no" autocomplete="off">
+                <label class="btn btn-outline-danger" for="{key}-no">
+                    <i class="bi bi-x-lg"></i> No
+                </label>
+            </div>
+        </div>
+    """
+
+
+class _OrjsonDataStore(DataStore):
+    """DataStore that parses the USDM file with orjson."""
+
+    def _load_data(self) -> dict:
+        with open(self.filename, "rb") as file:
+            return orjson.loads(file.read())
+
+
+class Visit:
+    def __init__(self, file_path: str, errors: Errors):
+        self._errors = errors
+        self._usdm = USDM4()
+        self._file_path = file_path
+        self._builder: Builder = self._usdm.builder(errors)
+
+    def to_html(self, visit_id: str) -> str:
+        try:
+            self._data_store = self._load()
+            label, visit_data = self._visit_data(visit_id)
+            return self._generate_html(label, visit_data)
+        except Exception as e:
+            self._errors.exception(f"Failed generating HTML page", e)
+            return ""
+
+    def _visit_data(self, visit_id: str) -> tuple[str, dict]:
+        results = {}
+        label = "Not Found"
+        # instance_by_id is a dict lookup in the DataStore, bind it once for the loops
+        instance_by_id = self._data_store.instance_by_id
+        # Ids are unique across the store, so look the visit up directly
+        encounter = instance_by_id(visit_id)
+        if encounter and encounter.get("instanceType") == "Encounter":
+            label = encounter["label"]
+            timepoint = next(
+                (
+                    x
+                    for x in self._data_store.instances_by_klass(
+                        "ScheduledActivityInstance"
+                    )
+                    if x["encounterId"] == encounter["id"]
+                ),
+                None,
+            )
+            if timepoint:
+                criteria = self._data_store.instances_by_klass("EligibilityCriterion")
+                for id in timepoint["activityIds"]:
+                    activity = instance_by_id(id)
+                    key = activity["label"]
+                    if key not in results:
+                        if activity["label"].startswith("Inclusion"):
+                            # Single pass bucketing by category: inclusion, exclusion
+                            buckets = {"C25532": [], "C25370": []}
+                            for ec in criteria:
+                                bucket = buckets.get(ec["category"]["code"])
+                                if bucket is not None:
+                                    bucket.append(ec)
+                            results["Inclusion Criteria"] = self._criteria_html(
+                                "IN", buckets["C25532"]
+                            )
+                            results["Exclusion Criteria"] = self._criteria_html(
+                                "EX", buckets["C25370"]
+                            )
+                        else:
+                            results[key] = []
+        return label, results
+
+    def _load(self) -> DataStore:
+        if orjson is None:
+            self._builder.seed(self._file_path)
+            return self._builder._data_store
+        # The page only reads the store, so the builder's id manager does not
+        # need seeding and the store can be built directly
+        data_store = _OrjsonDataStore(self._file_path)
+        data_store.decompose()
+        return data_store
+
+    def _criteria_html(self, prefix: str, criteria: list) -> list:
+        instance_by_id = self._data_store.instance_by_id
+        results = []
+        for ec in criteria:
+            identifier, item_id = _criterion_keys(ec)
+            eci = instance_by_id(item_id)
+            translated_text = self._translate_references(eci, eci["text"])
+            results.append(_criterion_html(prefix, identifier, translated_text))
+        return results
+
+    def _generate_html(self, label: str, data: dict):
+        cards = "".join(
+            _CARD.format(
+                title=k, items="".join(_ITEM.format(item) for item in v or _PLACEHOLDER)
+            )
+            for k, v in data.items()
+        )
+        body = _BODY.format(cards=cards)
+        return _HTML_PAGE.format(label=label, body=body)
 
     def _translate_references(self, instance: dict, text: str) -> str:
         text = self._wrap_tag(text, "u")
@@ -202,7 +216,6 @@ class Visit:
         return str(soup)
 
     def _translate_references_recurse(self, instance: dict, text: str) -> str:
-        # print(f"LEVEL: {text}")
         soup = self._get_soup(text)
         for ref in soup(["usdm:ref", "usdm:tag"]):
             try:
@@ -250,11 +263,11 @@ class Visit:
             return ""
 
 
-def save_html(file_path, result):
-    soup = BeautifulSoup(result, "html.parser")
-    data = soup.prettify()
-    with open(file_path, "w") as f:
-        f.write(data)
+def save_html(file_path, result, pretty=False):
+    if pretty:
+        result = BeautifulSoup(result, "html.parser").prettify()
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(result)
 
 
 if __name__ == "__main__":
@@ -265,6 +278,11 @@ if __name__ == "__main__":
     )
     parser.add_argument("filename", help="The name of the USDM file.")
     parser.add_argument("id", help="The id for the visit.")
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Re-indent the page with BeautifulSoup before saving.",
+    )
     args = parser.parse_args()
     filename = args.filename
     id = args.id
@@ -283,4 +301,4 @@ if __name__ == "__main__":
     timeline = Visit(full_filename, errors)
     html = timeline.to_html(id)
     print(f"Errors: {errors.dump(0)}")
-    save_html(full_output_filename, html)
+    save_html(full_output_filename, html, args.pretty)
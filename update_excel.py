@@ -2,8 +2,14 @@ import os
 import argparse
 import yaml
 from openpyxl import load_workbook
+from openpyxl.cell import Cell
 from openpyxl.styles import PatternFill
-from openpyxl.utils import get_column_letter
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader
 
 
 # Colors for highlighting changes
@@ -15,25 +21,57 @@ ADD_FILL = PatternFill(start_color=LIGHT_GREEN, end_color=LIGHT_GREEN, fill_type
 
 
 def update_cell(sheet, row, col, value):
-    """Update a cell value and apply orange highlighting."""
+    """Update a cell value and apply orange highlighting.
+
+    Returns False, leaving the cell alone, if it already holds the value
+    and is highlighted.
+    """
     cell = sheet.cell(row=row, column=col)
+    if cell.value == value and cell.fill == UPDATE_FILL:
+        return False
     cell.value = value
     cell.fill = UPDATE_FILL
+    return True
 
 
 def add_row(sheet, row_num, row_data, is_new_sheet=False):
     """Add a row of data with appropriate highlighting."""
-    fill = ADD_FILL if is_new_sheet else ADD_FILL
+    # Additions are green whether or not the sheet is new
     for col_idx, value in enumerate(row_data, start=1):
         cell = sheet.cell(row=row_num, column=col_idx)
         cell.value = value
+        cell.fill = ADD_FILL
+
+
+def append_row(sheet, row_data, fill):
+    """Append a row of data after the last used row with highlighting."""
+    cells = []
+    for value in row_data:
+        cell = Cell(sheet, value=value)
         cell.fill = fill
+        cells.append(cell)
+    sheet.append(cells)
+
+
+def is_trailing_row(sheet, row_num):
+    """Check if row_num is the row Worksheet.append would write next.
 
+    That is the row after the last used one. An empty sheet reports a
+    max_row of 1 as well, so sheets of one row or none are never treated
+    as trailing. Callers only append non-empty rows, which keeps
+    max_row in step with where append writes.
+    """
+    last_row = sheet.max_row
+    return last_row > 1 and row_num == last_row + 1
 
-def process_existing_sheet(workbook, sheet_config):
-    """Process updates to an existing sheet."""
+
+def process_existing_sheet(workbook, sheet_config, existing):
+    """Process updates to an existing sheet.
+
+    existing is the set of sheet names already in the workbook.
+    """
     sheet_name = sheet_config.get("name")
-    if sheet_name not in workbook.sheetnames:
+    if sheet_name not in existing:
         print(f"Warning: Sheet '{sheet_name}' not found in workbook, skipping")
         return False
 
@@ -47,9 +85,11 @@ def process_existing_sheet(workbook, sheet_config):
             col = update.get("col")
             value = update.get("value")
             if row and col and value is not None:
-                update_cell(sheet, row, col, value)
-                modified = True
-                print(f"  Updated cell ({row}, {col}) = '{value}'")
+                if update_cell(sheet, row, col, value):
+                    modified = True
+                    print(f"  Updated cell ({row}, {col}) = '{value}'")
+                else:
+                    print(f"  Unchanged cell ({row}, {col}) = '{value}'")
 
     # Process row additions
     if "add_rows" in sheet_config:
@@ -61,16 +101,24 @@ def process_existing_sheet(workbook, sheet_config):
             # Support both single row (data) and multiple rows (rows)
             if "rows" in row_config:
                 # Multiple rows starting from the specified row
-                for offset, row_data in enumerate(row_config["rows"]):
+                rows = row_config["rows"]
+                trailing = all(rows) and is_trailing_row(sheet, start_row)
+                for offset, row_data in enumerate(rows):
                     row_num = start_row + offset
-                    add_row(sheet, row_num, row_data, is_new_sheet=False)
+                    if trailing:
+                        append_row(sheet, row_data, ADD_FILL)
+                    else:
+                        add_row(sheet, row_num, row_data, is_new_sheet=False)
                     modified = True
                     print(f"  Added row {row_num} with {len(row_data)} cells")
             elif "data" in row_config:
                 # Single row (backwards compatible)
                 data = row_config.get("data", [])
                 if data:
-                    add_row(sheet, start_row, data, is_new_sheet=False)
+                    if is_trailing_row(sheet, start_row):
+                        append_row(sheet, data, ADD_FILL)
+                    else:
+                        add_row(sheet, start_row, data, is_new_sheet=False)
                     modified = True
                     print(f"  Added row {start_row} with {len(data)} cells")
 
@@ -81,24 +129,29 @@ def process_existing_sheet(workbook, sheet_config):
     return modified
 
 
-def process_new_sheet(workbook, sheet_config):
-    """Create and populate a new sheet."""
+def process_new_sheet(workbook, sheet_config, existing):
+    """Create and populate a new sheet.
+
+    existing is the set of sheet names already in the workbook, the new
+    sheet's name is added to it.
+    """
     sheet_name = sheet_config.get("name")
     if not sheet_name:
         print("Warning: New sheet missing 'name', skipping")
         return False
 
-    if sheet_name in workbook.sheetnames:
+    if sheet_name in existing:
         print(f"Warning: Sheet '{sheet_name}' already exists, skipping new sheet creation")
         return False
 
     sheet = workbook.create_sheet(title=sheet_name)
+    existing.add(sheet_name)
     print(f"  Created new sheet '{sheet_name}'")
 
-    # Process row additions
+    # Process row additions, the sheet is empty so rows can simply be appended
     if "rows" in sheet_config:
         for row_idx, row_data in enumerate(sheet_config["rows"], start=1):
-            add_row(sheet, row_idx, row_data, is_new_sheet=True)
+            append_row(sheet, row_data, ADD_FILL)
             print(f"  Added row {row_idx} with {len(row_data)} cells")
 
     # Set sheet tab color for new sheet
@@ -109,8 +162,10 @@ def process_new_sheet(workbook, sheet_config):
 
 def load_yaml_config(yaml_path):
     """Load the YAML configuration file."""
+    if not yaml.__with_libyaml__:
+        print("Warning: PyYAML has no libyaml support, using the slower pure-Python loader")
     with open(yaml_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 
 def generate_output_filename(input_path):
@@ -135,6 +190,11 @@ def main():
         help="Output filename (default: input filename with '_amended' suffix)",
         default=None
     )
+    parser.add_argument(
+        "--drop-links",
+        action="store_true",
+        help="Do not load (or save) external workbook links, faster on heavily linked workbooks"
+    )
     args = parser.parse_args()
 
     # Validate input files exist
@@ -148,10 +208,19 @@ def main():
 
     # Load workbook and config
     print(f"\nLoading workbook: {args.excel_file}")
-    workbook = load_workbook(args.excel_file)
+    # Formulas are kept as written (data_only=False), so untouched sheets round
+    # trip unchanged. Only the formula text is kept, not the cached values
+    workbook = load_workbook(
+        args.excel_file,
+        keep_vba=False,
+        keep_links=not args.drop_links,
+        data_only=False,
+        rich_text=False,
+    )
 
     print(f"Loading configuration: {args.yaml_file}")
     config = load_yaml_config(args.yaml_file)
+    existing = set(workbook.sheetnames)
 
     # Process existing sheets
     if "existing_sheets" in config:
@@ -159,13 +228,13 @@ def main():
         for sheet_config in config["existing_sheets"]:
             sheet_name = sheet_config.get("name", "unnamed")
             print(f"\n  Sheet: {sheet_name}")
-            process_existing_sheet(workbook, sheet_config)
+            process_existing_sheet(workbook, sheet_config, existing)
 
     # Process new sheets
     if "new_sheets" in config:
         print("\nProcessing new sheets:")
         for sheet_config in config["new_sheets"]:
-            process_new_sheet(workbook, sheet_config)
+            process_new_sheet(workbook, sheet_config, existing)
 
     # Determine output filename
     output_path = args.output if args.output else generate_output_filename(args.excel_file)
@@ -6,31 +6,46 @@ This script validates USDM (Unified Study Definitions Model) JSON files
 using the CDISC Rules Engine (CORE).
 
 Usage:
-    python usdm_validate.py <usdm_file.json> [options]
+    python usdm_validate.py <usdm_file.json> [<usdm_file.json> ...] [options]
 
 Options:
     -v, --version    USDM version (3-0 or 4-0, default: 4-0)
     -o, --output     Output file for validation results (default: stdout)
     -f, --format     Output format: json or text (default: text)
+    -j, --jobs       Number of processes validating rules, 0 for one per CPU
+                     (default: 1)
     --verbose        Show verbose output
 """
 
-import argparse
-import io
+import copy
 import json
 import logging
+import mmap
 import os
 import sys
-import urllib.request
-from contextlib import redirect_stdout, redirect_stderr
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Map CDISC_API_KEY to the key name expected by cdisc-rules-engine
 if "CDISC_API_KEY" in os.environ and "CDISC_LIBRARY_API_KEY" not in os.environ:
     os.environ["CDISC_LIBRARY_API_KEY"] = os.environ["CDISC_API_KEY"]
 
 # Suppress verbose logging from cdisc-rules-engine unless in verbose mode
 # The engine uses the root logger via ConsoleLogger - we must disable it entirely
+# while it is imported and while it runs, the caller's setting is restored after
+_caller_logging_disable = logging.root.manager.disable
 logging.disable(logging.CRITICAL)  # Disable ALL logging globally
 
 try:
@@ -38,6 +53,7 @@ try:
     from cdisc_rules_engine.config import config
     from cdisc_rules_engine.services.cache import CacheServiceFactory
     from cdisc_rules_engine.rules_engine import RulesEngine
+    from cdisc_rules_engine.services.data_services import USDMDataService
     from cdisc_rules_engine.utilities.utils import get_rules_cache_key
     from cdisc_rules_engine.services.cdisc_library_service import CDISCLibraryService
     from cdisc_rules_engine.constants.cache_constants import PUBLISHED_CT_PACKAGES
@@ -50,6 +66,7 @@ except ImportError:
     print("Error: cdisc-rules-engine package is not installed.")
     print("Install it with: pip install cdisc-rules-engine")
     sys.exit(1)
+logging.disable(_caller_logging_disable)
 
 # GitHub URLs for JSONata custom functions
 JSONATA_FILES = [
@@ -152,48 +169,152 @@ XHTML_SCHEMA_FILES = [
     "xhtml-1.1/xhtml-simple-1.xsd",
 ]
 
+# Written once a resource directory has been fully downloaded, so later runs
+# need a single check to skip the setup
+SETUP_MARKER = ".ready_v1"
+
+# Number of resource files downloaded at once
+DOWNLOAD_WORKERS = 16
+DOWNLOAD_TIMEOUT = 60  # seconds
+
+# Library responses (rules, CT package list and CT package data) are kept on
+# disk between runs, delete the directory to force a fresh download
+CACHE_DIR = Path.home() / ".cache" / "usdm_validate"
+CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Engine error messages that mean a rule does not apply, rather than a finding
+EXECUTION_ERRORS = frozenset({
+    # Column not found - rule checks fields that don't exist on entity
+    "Column not found in data",
+    # Preprocessing failed - rule requires dataset not in USDM file
+    "Error occurred during dataset preprocessing",
+})
+
 # Rules known to have bugs in the CORE engine (JSONata/NoneType errors)
-EXCLUDED_RULES = {
+EXCLUDED_RULES = frozenset({
     "CORE-000955",  # JSONata bug
     "CORE-000956",  # JSONata bug
-}
+})
 
 
 class SuppressOutput:
-    """Context manager to suppress stdout/stderr from third-party libraries."""
+    """
+    Context manager to suppress stdout/stderr from third-party libraries.
+
+    File descriptors 1 and 2 are pointed at the null device as well, so
+    output written below sys.stdout/sys.stderr, say by native code, is also
+    dropped, and nothing is buffered in memory.
+    """
 
     def __init__(self, suppress: bool = True):
         self.suppress = suppress
         self._stdout = None
         self._stderr = None
         self._devnull = None
+        self._saved_fds = None
 
     def __enter__(self):
         if self.suppress:
-            self._devnull = io.StringIO()
             self._stdout = sys.stdout
             self._stderr = sys.stderr
+            self._stdout.flush()
+            self._stderr.flush()
+            self._devnull = open(os.devnull, "w")
+            self._saved_fds = (os.dup(1), os.dup(2))
+            os.dup2(self._devnull.fileno(), 1)
+            os.dup2(self._devnull.fileno(), 2)
             sys.stdout = self._devnull
             sys.stderr = self._devnull
         return self
 
     def __exit__(self, *args):
         if self.suppress:
+            self._devnull.flush()
             sys.stdout = self._stdout
             sys.stderr = self._stderr
+            for fd, saved in zip((1, 2), self._saved_fds):
+                os.dup2(saved, fd)
+                os.close(saved)
             self._devnull.close()
 
 
+# Session shared by the resource downloads, created on first use
+_session = None
+
+
+def _download_session() -> requests.Session:
+    """
+    Return the session used for resource downloads.
+
+    Connections are kept open and reused by later downloads from the same
+    host, and failed requests are retried.
+    """
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(
+            pool_maxsize=DOWNLOAD_WORKERS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        _session = requests.Session()
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
+def _download_file(url: str, filepath: str) -> bool:
+    """
+    Download a single file, returning whether it succeeded.
+
+    Files already present, say from an earlier partly failed setup, are kept.
+    The download goes to a temporary file that is only renamed into place once
+    complete, so an interrupted download never looks like a present file.
+    """
+    if os.path.exists(filepath):
+        return True
+    partial = f"{filepath}.part"
+    try:
+        response = _download_session().get(url, timeout=DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        with open(partial, "wb") as f:
+            f.write(response.content)
+        os.replace(partial, filepath)
+        return True
+    except Exception:
+        if os.path.exists(partial):
+            os.remove(partial)
+        return False
+
+
+def download_files(downloads: list) -> list:
+    """
+    Download files concurrently, the downloads are network bound so threads suffice.
+
+    Args:
+        downloads: List of (url, filepath) pairs
+
+    Returns:
+        List of success flags, one per download
+    """
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        return list(executor.map(lambda download: _download_file(*download), downloads))
+
+
 def setup_xsd_schema_resources():
     """
     Download XSD schema files from GitHub if they don't exist locally.
     These are required for XHTML validation rules (CORE-000945, CORE-001069).
     """
     schema_base_dir = _CDISC_PACKAGE_DIR / "resources" / "schema" / "xml"
+    marker = schema_base_dir / SETUP_MARKER
+    if marker.exists():
+        return True
 
     # Check if USDM XHTML schema already exists
-    usdm_xhtml_dir = schema_base_dir / "cdisc-usdm-xhtml-1.0"
-    if usdm_xhtml_dir.exists() and (usdm_xhtml_dir / "usdm-xhtml-1.0.xsd").exists():
+    if (schema_base_dir / "cdisc-usdm-xhtml-1.0" / "usdm-xhtml-1.0.xsd").exists():
         return True
 
     # Create directories
@@ -201,15 +322,17 @@ def setup_xsd_schema_resources():
     (schema_base_dir / "xhtml-1.1").mkdir(parents=True, exist_ok=True)
 
     # Download USDM XHTML schema files
+    # Continue even if some files fail - not all may be needed
     all_schema_files = USDM_XHTML_SCHEMA_FILES + XHTML_SCHEMA_FILES
-    for schema_path in all_schema_files:
-        url = f"{XSD_GITHUB_BASE}/{schema_path}"
-        filepath = schema_base_dir / schema_path
-        try:
-            urllib.request.urlretrieve(url, filepath)
-        except Exception:
-            # Continue even if some files fail - not all may be needed
-            pass
+    base_dir = str(schema_base_dir)
+    downloaded = download_files(
+        [
+            (f"{XSD_GITHUB_BASE}/{schema_path}", os.path.join(base_dir, *schema_path.split("/")))
+            for schema_path in all_schema_files
+        ]
+    )
+    if all(downloaded):
+        marker.touch()
 
     return True
 
@@ -220,26 +343,58 @@ def setup_jsonata_resources():
     These are required for certain CORE rules that use JSONata expressions.
     """
     jsonata_dir = _CDISC_PACKAGE_DIR / "resources" / "jsonata"
+    marker = jsonata_dir / SETUP_MARKER
 
     # Check if already set up
-    if jsonata_dir.exists() and any(jsonata_dir.glob("*.jsonata")):
+    if marker.exists() or any(jsonata_dir.glob("*.jsonata")):
         return True
 
     # Create the directory
     jsonata_dir.mkdir(parents=True, exist_ok=True)
 
-    # Download each file
-    for url in JSONATA_FILES:
-        filename = url.split("/")[-1]
-        filepath = jsonata_dir / filename
-        try:
-            urllib.request.urlretrieve(url, filepath)
-        except Exception:
-            return False
-
+    # Download the files, all of them are needed
+    base_dir = str(jsonata_dir)
+    if not all(
+        download_files(
+            [(url, os.path.join(base_dir, url.rsplit("/", 1)[-1])) for url in JSONATA_FILES]
+        )
+    ):
+        return False
+    marker.touch()
     return True
 
 
+def read_disk_cache(name: str):
+    """
+    Read a library response saved by an earlier run.
+
+    Args:
+        name: The cache entry name
+
+    Returns:
+        The saved data, or None if there is none or it is older than CACHE_MAX_AGE
+    """
+    path = CACHE_DIR / f"{name}.json"
+    try:
+        if time.time() - path.stat().st_mtime > CACHE_MAX_AGE:
+            return None
+        return _load_json(path)
+    except (OSError, ValueError):
+        return None
+
+
+def write_disk_cache(name: str, data) -> None:
+    """Save a library response for later runs, failures only lose the cache entry."""
+    path = CACHE_DIR / f"{name}.json"
+    partial = path.with_name(f"{path.name}.part")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _save_json(partial, data)
+        os.replace(partial, path)
+    except (OSError, TypeError, ValueError):
+        partial.unlink(missing_ok=True)
+
+
 def setup_ct_packages(cache):
     """
     Load the list of available CT packages into the cache and return them.
@@ -262,11 +417,14 @@ def setup_ct_packages(cache):
 
     try:
         library_service = CDISCLibraryService(api_key, cache)
-        # Get all CT packages from CDISC Library
-        packages = library_service.get_all_ct_packages()
-        available_packages = [
-            package.get("href", "").split("/")[-1] for package in packages
-        ]
+        available_packages = read_disk_cache("ct_packages")
+        if not available_packages:
+            # Get all CT packages from CDISC Library
+            packages = library_service.get_all_ct_packages()
+            available_packages = [
+                package.get("href", "").split("/")[-1] for package in packages
+            ]
+            write_disk_cache("ct_packages", available_packages)
         cache.add(PUBLISHED_CT_PACKAGES, available_packages)
         return available_packages, library_service
     except Exception:
@@ -286,10 +444,17 @@ def load_ct_package_data(library_service, package_version: str) -> dict:
     """
     if not library_service:
         return {}
+    cache_name = f"ct_{package_version}"
+    ct_data = read_disk_cache(cache_name)
+    if ct_data:
+        return ct_data
     try:
-        return library_service.get_codelist_terms_map(package_version)
+        ct_data = library_service.get_codelist_terms_map(package_version)
     except Exception:
         return {}
+    if ct_data:
+        write_disk_cache(cache_name, ct_data)
+    return ct_data
 
 
 def get_ct_versions_from_usdm(usdm_data: dict) -> set:
@@ -305,17 +470,28 @@ def get_ct_versions_from_usdm(usdm_data: dict) -> set:
     """
     versions = set()
 
-    def extract_versions(obj):
-        if isinstance(obj, dict):
+    # Walk the tree with an explicit stack, deep studies cannot hit the
+    # recursion limit and no call is made per node. Only dicts and lists are
+    # pushed, the strings and numbers making up most of the values are never
+    # popped again.
+    if not isinstance(usdm_data, (dict, list)):
+        return versions
+    stack = [usdm_data]
+    pop = stack.pop
+    append = stack.append
+    while stack:
+        obj = pop()
+        if type(obj) is dict:
             if "codeSystemVersion" in obj:
                 versions.add(obj["codeSystemVersion"])
-            for value in obj.values():
-                extract_versions(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                extract_versions(item)
+            values = obj.values()
+        else:
+            values = obj
+        for value in values:
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                append(value)
 
-    extract_versions(usdm_data)
     return versions
 
 
@@ -339,29 +515,70 @@ def load_rules_from_library(cache, standard: str, version: str, verbose: bool =
             "Set CDISC_API_KEY or CDISC_LIBRARY_API_KEY environment variable."
         )
 
-    if verbose:
-        print(f"Downloading {standard} {version} rules from CDISC Library...")
-
-    library_service = CDISCLibraryService(api_key, cache)
-
-    # Get the rules for this standard/version
-    result = library_service.get_rules_by_catalog(standard, version)
+    # Get the rules for this standard/version, from an earlier run if possible
+    cache_name = f"rules_{standard}_{version}"
+    result = read_disk_cache(cache_name)
+    downloaded = not result
+    if downloaded:
+        if verbose:
+            print(f"Downloading {standard} {version} rules from CDISC Library...")
+        library_service = CDISCLibraryService(api_key, cache)
+        result = library_service.get_rules_by_catalog(standard, version)
 
     # Extract rules list from the response dict
     rules = result.get("rules", []) if isinstance(result, dict) else result
     cache_key = result.get("key_prefix", get_rules_cache_key(standard, version))
 
-    if verbose:
-        print(f"Downloaded {len(rules)} rules")
+    if downloaded:
+        if verbose:
+            print(f"Downloaded {len(rules)} rules")
+        if rules:
+            write_disk_cache(cache_name, result)
 
-    # Cache the rules
-    for rule in rules:
-        rule_id = rule.get("core_id", "unknown")
-        cache.add(f"{cache_key}/{rule_id}", rule)
+    # Cache the rules with a single call
+    prefix = cache_key + "/"
+    cache.add_all({prefix + rule.get("core_id", "unknown"): rule for rule in rules})
 
     return rules
 
 
+def _load_json(path) -> dict:
+    """
+    Parse a JSON file, with orjson when it is available.
+
+    orjson parses the file mapped into memory, without copying it into a
+    buffer first. Empty files cannot be mapped and are read instead.
+    """
+    if orjson is not None:
+        with open(path, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                return orjson.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_json(path, data) -> None:
+    """Write data to a JSON file, with orjson when it is available."""
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def _file_contains(path, needle: bytes) -> bool:
+    """Check if a file contains the bytes, searching it mapped into memory."""
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped.find(needle) != -1
+
+
 def load_usdm_file(file_path: str) -> dict:
     """
     Load and parse a USDM JSON file.
@@ -380,8 +597,9 @@ def load_usdm_file(file_path: str) -> dict:
     if not path.suffix.lower() == ".json":
         raise ValueError(f"Expected a JSON file, got: {path.suffix}")
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # A file that never mentions a 'study' key cannot have one, it is
+    # rejected without parsing it
+    data = _load_json(path) if _file_contains(path, b'"study"') else {}
 
     # Validate that this looks like a USDM file
     if "study" not in data:
@@ -396,7 +614,8 @@ def load_usdm_file(file_path: str) -> dict:
 def validate_usdm(
     file_path: str,
     version: str = "4-0",
-    verbose: bool = False
+    verbose: bool = False,
+    jobs: int = 1
 ) -> dict:
     """
     Validate a USDM JSON file using the CDISC Rules Engine.
@@ -405,79 +624,134 @@ def validate_usdm(
         file_path: Path to the USDM JSON file
         version: USDM version (3-0 or 4-0)
         verbose: Whether to print verbose output
+        jobs: Number of processes validating rules, 1 validates in this process
+              and 0 uses one per CPU
 
     Returns:
         Dict containing validation results and metadata:
         - results: List of validation result dicts
         - ct_packages_count: Number of CT packages loaded
         - ct_packages: List of CT package names
+        - ct_packages_loaded: List of CT packages whose data was loaded
+        - summary: Issue counts, see _summarise_results()
+        - has_errors: Whether any rule reported errors
     """
-    abs_path = os.path.abspath(file_path)
-
-    # Validate the file first (before suppressing output)
-    load_usdm_file(file_path)  # Will raise if invalid
+    return validate_usdm_files([file_path], version, verbose, jobs)[0]
 
-    # The CDISC Rules Engine expects 'resources' directory in CWD.
-    # Change to the site-packages directory where resources are installed.
-    original_cwd = os.getcwd()
-    os.chdir(_CDISC_PACKAGE_DIR)
 
-    try:
-        # Re-enable logging if verbose mode requested
-        if verbose:
-            logging.disable(logging.NOTSET)  # Re-enable logging
-            logging.getLogger().setLevel(logging.INFO)
+def validate_usdm_files(
+    file_paths: list,
+    version: str = "4-0",
+    verbose: bool = False,
+    jobs: int = 1
+) -> list:
+    """
+    Validate several USDM JSON files, setting up the cache, CT packages and
+    rules once for all of them.
 
-        # Suppress ALL output from cdisc-rules-engine (it uses print statements)
-        with SuppressOutput(suppress=not verbose):
-            return _run_validation(abs_path, version, verbose)
-    finally:
-        # Restore original working directory
-        os.chdir(original_cwd)
-        # Re-disable logging
-        if verbose:
-            logging.disable(logging.CRITICAL)
+    Args:
+        file_paths: Paths to the USDM JSON files
+        version: USDM version (3-0 or 4-0)
+        verbose: Whether to print verbose output
+        jobs: Number of processes validating rules, 1 validates in this process
+              and 0 uses one per CPU
 
+    Returns:
+        List with the validate_usdm() dict of each file, in the same order
+    """
+    abs_paths = [os.path.abspath(file_path) for file_path in file_paths]
 
-def _run_validation(abs_path: str, version: str, verbose: bool) -> dict:
-    """Internal validation logic, separated to allow output suppression."""
-    # Setup resources (download from GitHub if needed)
-    setup_jsonata_resources()
-    setup_xsd_schema_resources()
+    # Validate the files first (before suppressing output), only the CT
+    # versions they use are kept
+    ct_versions = [
+        get_ct_versions_from_usdm(load_usdm_file(file_path))  # Will raise if invalid
+        for file_path in file_paths
+    ]
 
-    # Initialize the cache service
-    cache = CacheServiceFactory(config).get_cache_service()
+    if jobs < 1:
+        jobs = os.cpu_count() or 1
 
-    # Setup CT packages list and get library service for loading CT data
-    ct_packages, library_service = setup_ct_packages(cache)
+    with _engine_working_dir():
+        previous_disable = logging.root.manager.disable
+        if verbose:
+            # Re-enable logging if verbose mode requested
+            logging.disable(logging.NOTSET)
+            logging.getLogger().setLevel(logging.INFO)
+        else:
+            logging.disable(logging.CRITICAL)  # Disable ALL logging globally
 
-    # Load USDM data to determine which CT package versions are needed
-    with open(abs_path, "r", encoding="utf-8") as f:
-        usdm_data = json.load(f)
+        try:
+            # Suppress ALL output from cdisc-rules-engine (it uses print statements)
+            with SuppressOutput(suppress=not verbose):
+                prepared = _prepare_validation(version, set().union(*ct_versions))
+                return [
+                    _run_validation(
+                        prepared,
+                        abs_path,
+                        versions,
+                        version,
+                        verbose,
+                        jobs,
+                        # The engine compiles rule conditions in place, the shared
+                        # rules are copied for each file. Worker processes are
+                        # sent copies anyway.
+                        prepared["rules"] if jobs > 1 else copy.deepcopy(prepared["rules"]),
+                    )
+                    for abs_path, versions in zip(abs_paths, ct_versions)
+                ]
+        finally:
+            # Restore the caller's logging
+            logging.disable(previous_disable)
+
+
+# Held while the engine runs, the working directory is shared by all threads
+_ENGINE_LOCK = threading.RLock()
+
+
+@contextmanager
+def _engine_working_dir():
+    """
+    Run with the site-packages directory where resources are installed as CWD.
 
-    # Extract CT versions from the USDM data
-    ct_versions_needed = get_ct_versions_from_usdm(usdm_data)
+    The CDISC Rules Engine opens its 'resources' directory relative to CWD and
+    has no setting for another location, so the directory is only changed when
+    needed and always restored. Validations from several threads take turns,
+    which also protects the engine's singleton data service.
+    """
+    with _ENGINE_LOCK:
+        original_cwd = os.getcwd()
+        if original_cwd == str(_CDISC_PACKAGE_DIR):
+            yield
+            return
+        os.chdir(_CDISC_PACKAGE_DIR)
+        try:
+            yield
+        finally:
+            # Restore original working directory
+            os.chdir(original_cwd)
 
-    # For USDM, load sdtmct and ddfct packages for each version found
-    ct_package_metadata = {}
-    loaded_packages = []
-    if library_service and ct_versions_needed:
-        for ct_version in ct_versions_needed:
-            for ct_type in ["sdtmct", "ddfct"]:
-                package_name = f"{ct_type}-{ct_version}"
-                if package_name in ct_packages:
-                    ct_data = load_ct_package_data(library_service, package_name)
-                    if ct_data:
-                        ct_package_metadata[package_name] = ct_data
-                        loaded_packages.append(package_name)
 
-    # Create library metadata container with both package list AND package data
-    library_metadata = LibraryMetadataContainer(
-        published_ct_packages=ct_packages,
-        ct_package_metadata=ct_package_metadata,
-    )
+def _clear_file_cache(cache) -> None:
+    """
+    Drop what the engine cached while validating the previous file.
 
-    # Initialize rules engine for USDM
+    Entity datasets and rule operation results are cached without the file
+    in their keys, a later file would be checked against them otherwise. The
+    CT package list and library responses are kept.
+    """
+    cache.clear_all("operations/")
+    dataset_cache = getattr(cache, "dataset_cache", None)
+    if dataset_cache is not None:
+        dataset_cache.clear()
+
+
+def _build_rules_engine(cache, abs_path: str, version: str, library_metadata):
+    """Create a USDM rules engine for the file, returns the engine and its datasets."""
+    # The data service is a singleton holding the first file it was built for,
+    # and the cache keeps the entity data of the last file validated. A forked
+    # worker inherits the parent's.
+    USDMDataService._instance = None
+    _clear_file_cache(cache)
     rules_engine = RulesEngine(
         cache=cache,
         standard="usdm",
@@ -485,9 +759,126 @@ def _run_validation(abs_path: str, version: str, verbose: bool) -> dict:
         dataset_paths=[abs_path],
         library_metadata=library_metadata,
     )
+    return rules_engine, rules_engine.data_service.get_datasets()
+
+
+def _rule_metadata(rule: dict) -> tuple:
+    """Return the rule's id, description and action message."""
+    actions = rule.get("actions")
+    params = actions[0].get("params", {}) if actions and isinstance(actions, list) else {}
+    return (
+        rule.get("core_id", "unknown"),
+        rule.get("description", ""),
+        params.get("message", ""),
+    )
+
+
+def _validate_rule(validate, datasets, rule: dict) -> tuple:
+    """
+    Run a single rule, returning its execution status and results.
+
+    Args:
+        validate: The rules engine's validate_single_rule, bound once by the caller
+        datasets: The datasets of the file being validated
+        rule: The rule to run
+    """
+    try:
+        rule_results = validate(rule, datasets)
+    except Exception:
+        return "error", []
+    return "success", list(rule_results.values()) if rule_results else []
 
-    # Get datasets from data service
-    datasets = rules_engine.data_service.get_datasets()
+
+# Rules engine of a worker process, set up once by _init_worker
+_worker_validate = None
+_worker_datasets = None
+
+
+def _init_worker(abs_path: str, version: str, library_metadata, suppress: bool):
+    """Build the rules engine a worker process uses for all of its rules."""
+    global _worker_validate, _worker_datasets
+    if suppress:
+        # Workers started by spawn do not inherit the parent's suppression
+        logging.disable(logging.CRITICAL)
+        SuppressOutput(suppress=True).__enter__()
+    cache = CacheServiceFactory(config).get_cache_service()
+    cache.add(PUBLISHED_CT_PACKAGES, library_metadata.published_ct_packages)
+    rules_engine, _worker_datasets = _build_rules_engine(
+        cache, abs_path, version, library_metadata
+    )
+    _worker_validate = rules_engine.validate_single_rule
+
+
+def _validate_rule_in_worker(rule: dict) -> tuple:
+    """Run a single rule with the worker process's engine."""
+    return _validate_rule(_worker_validate, _worker_datasets, rule)
+
+
+# Set up shared by validations in this process, by (USDM version, API key)
+_PREPARED_VALIDATIONS = {}
+
+
+def _prepare_validation(version: str, ct_versions_needed: set) -> dict:
+    """
+    Set up everything shared by the files being validated.
+
+    The set up is kept for later calls in the same process, only the data of
+    CT packages not loaded before is fetched then. What the engine caches
+    about a file is dropped before each file, see _clear_file_cache().
+
+    Args:
+        version: USDM version (3-0 or 4-0)
+        ct_versions_needed: CT versions used by any of the files
+
+    Returns:
+        Dict with the cache, the published CT package list, the data of the
+        CT packages loaded so far and the rules to run, which must not be
+        modified
+    """
+    key = (version, os.environ.get("CDISC_LIBRARY_API_KEY"))
+    prepared = _PREPARED_VALIDATIONS.get(key)
+    if prepared is None:
+        prepared = _build_prepared_validation(version)
+        # Without rules nothing ran, try again on the next call
+        if prepared["rules"]:
+            _PREPARED_VALIDATIONS[key] = prepared
+
+    # For USDM, load sdtmct and ddfct packages for each version found
+    ct_packages = prepared["ct_packages"]
+    library_service = prepared["library_service"]
+    ct_package_metadata = prepared["ct_package_metadata"]
+    if library_service and ct_versions_needed:
+        package_names = [
+            package_name
+            for ct_version in ct_versions_needed
+            for package_name in (f"sdtmct-{ct_version}", f"ddfct-{ct_version}")
+            if package_name in ct_packages and package_name not in ct_package_metadata
+        ]
+        # Each package is a separate CDISC Library request, fetch them together
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            loaded = executor.map(
+                load_ct_package_data,
+                [library_service] * len(package_names),
+                package_names,
+            )
+            for package_name, ct_data in zip(package_names, loaded):
+                if ct_data:
+                    ct_package_metadata[package_name] = ct_data
+
+    return prepared
+
+
+def _build_prepared_validation(version: str) -> dict:
+    """Set up the resources, cache, CT package list and rules of a USDM version."""
+    # Setup resources (download from GitHub if needed)
+    setup_jsonata_resources()
+    setup_xsd_schema_resources()
+
+    # Initialize the cache service
+    cache = CacheServiceFactory(config).get_cache_service()
+
+    # Setup CT packages list and get library service for loading CT data
+    ct_packages, library_service = setup_ct_packages(cache)
 
     # Get rules from cache
     cache_key = get_rules_cache_key("usdm", version)
@@ -497,50 +888,124 @@ def _run_validation(abs_path: str, version: str, verbose: bool) -> dict:
         # Download rules from CDISC Library
         rules = load_rules_from_library(cache, "usdm", version, verbose=False)
 
+    # Skip rules known to have bugs, reading each rule's metadata once
+    kept_rules = []
+    rule_metadata = []
+    for rule in rules or []:
+        metadata = _rule_metadata(rule)
+        if metadata[0] not in EXCLUDED_RULES:
+            kept_rules.append(rule)
+            rule_metadata.append(metadata)
+
+    return {
+        "cache": cache,
+        "ct_packages": ct_packages,
+        "library_service": library_service,
+        "ct_package_metadata": {},
+        "rules": kept_rules,
+        # (rule_id, description, message) of each rule, shared by all files
+        "rule_metadata": rule_metadata,
+    }
+
+
+def _prefetch_file(path: str) -> None:
+    """Hint the OS to read a file into the page cache, where supported."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _run_validation(
+    prepared: dict,
+    abs_path: str,
+    ct_versions_needed: set,
+    version: str,
+    verbose: bool,
+    jobs: int,
+    rules: list
+) -> dict:
+    """
+    Internal validation logic of a single file, separated to allow output
+    suppression.
+
+    prepared is the result of _prepare_validation(), rules the list of rules
+    this file may compile in place.
+    """
+    # The engine reads the file again, ask for it to be in the page cache
+    _prefetch_file(abs_path)
+
+    ct_packages = prepared["ct_packages"]
+    ct_package_metadata = {}
+    loaded_packages = []
+    for ct_version in ct_versions_needed:
+        for ct_type in ["sdtmct", "ddfct"]:
+            package_name = f"{ct_type}-{ct_version}"
+            if package_name in prepared["ct_package_metadata"]:
+                ct_package_metadata[package_name] = prepared["ct_package_metadata"][package_name]
+                loaded_packages.append(package_name)
+
+    # Create library metadata container with both package list AND package data
+    library_metadata = LibraryMetadataContainer(
+        published_ct_packages=ct_packages,
+        ct_package_metadata=ct_package_metadata,
+    )
+
     if not rules:
         return {
             "results": [],
             "ct_packages_count": len(ct_packages),
             "ct_packages": ct_packages,
             "ct_packages_loaded": loaded_packages,
+            "has_errors": False,
         }
 
     # Run validation for each rule
-    results = []
-    for rule in rules:
-        rule_id = rule.get("core_id", "unknown")
-
-        # Skip rules known to have bugs
-        if rule_id in EXCLUDED_RULES:
-            continue
-
-        # Extract rule description and action message
-        description = rule.get("description", "")
-        action_message = ""
-        actions = rule.get("actions", [])
-        if actions and isinstance(actions, list):
-            params = actions[0].get("params", {})
-            action_message = params.get("message", "")
+    if jobs > 1:
+        # Rules are independent, each worker builds its own engine once and
+        # validates a share of them
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(abs_path, version, library_metadata, not verbose),
+        ) as executor:
+            outcomes = list(
+                executor.map(
+                    _validate_rule_in_worker,
+                    rules,
+                    chunksize=max(1, len(rules) // (jobs * 4)),
+                )
+            )
+    else:
+        # Initialize rules engine for USDM
+        rules_engine, datasets = _build_rules_engine(
+            prepared["cache"], abs_path, version, library_metadata
+        )
+        validate = rules_engine.validate_single_rule
+        outcomes = [_validate_rule(validate, datasets, rule) for rule in rules]
+
+    results = [
+        {
+            "rule_id": rule_id,
+            "description": description,
+            "message": action_message,
+            "execution_status": status,
+            "results": found
+        }
+        for (rule_id, description, action_message), (status, found)
+        in zip(prepared["rule_metadata"], outcomes)
+    ]
 
-        try:
-            rule_results = rules_engine.validate_single_rule(rule, datasets)
-            result = {
-                "rule_id": rule_id,
-                "description": description,
-                "message": action_message,
-                "execution_status": "success",
-                "results": list(rule_results.values()) if rule_results else []
-            }
-            results.append(result)
-        except Exception:
-            result = {
-                "rule_id": rule_id,
-                "description": description,
-                "message": action_message,
-                "execution_status": "error",
-                "results": []
-            }
-            results.append(result)
+    # Count the issues once, the report and the exit code both use them
+    summary = _summarise_results(results)
 
     # Return results with metadata
     return {
@@ -548,6 +1013,8 @@ def _run_validation(abs_path: str, version: str, verbose: bool) -> dict:
         "ct_packages_count": len(ct_packages),
         "ct_packages": ct_packages,
         "ct_packages_loaded": loaded_packages,
+        "summary": summary,
+        "has_errors": bool(summary["validation_issues"] or summary["execution_errors"]),
     }
 
 
@@ -562,15 +1029,59 @@ def _is_execution_error(error: dict) -> bool:
     These are not data quality issues - they indicate the rule doesn't apply
     to this particular USDM file's structure.
     """
-    if isinstance(error, dict):
-        error_type = error.get("error", "")
-        # Column not found - rule checks fields that don't exist on entity
-        if error_type == "Column not found in data":
-            return True
-        # Preprocessing failed - rule requires dataset not in USDM file
-        if error_type == "Error occurred during dataset preprocessing":
-            return True
-    return False
+    return isinstance(error, dict) and error.get("error", "") in EXECUTION_ERRORS
+
+
+def _iter_result_errors(results: list):
+    """
+    Yield (result, errors) for each entry of the rule results that has errors.
+
+    The engine returns the entries of a rule either as a dict or as a list of
+    dicts, both shapes are handled here.
+    """
+    for result in results:
+        for r in result.get("results", []):
+            for item in r if isinstance(r, list) else (r,):
+                if isinstance(item, dict):
+                    errors = item.get("errors")
+                    if errors:
+                        yield result, errors
+
+
+def _summarise_results(results: list) -> dict:
+    """
+    Count the issues of the rule results in a single pass.
+
+    Returns:
+        Dict with:
+        - validation_issues: Number of validation findings
+        - execution_errors: Number of rule execution errors
+        - execution_error_rules: Number of rules with execution errors
+        - findings: (result, findings) of each result entry with findings
+    """
+    validation_issues = 0
+    execution_errors = 0
+    execution_error_rules = set()
+    findings = []
+
+    for result, errors in _iter_result_errors(results):
+        real_errors = []
+        for error in errors:
+            if _is_execution_error(error):
+                execution_errors += 1
+                execution_error_rules.add(result.get("rule_id", "Unknown"))
+            else:
+                real_errors.append(error)
+        if real_errors:
+            validation_issues += len(real_errors)
+            findings.append((result, real_errors))
+
+    return {
+        "validation_issues": validation_issues,
+        "execution_errors": execution_errors,
+        "execution_error_rules": len(execution_error_rules),
+        "findings": findings,
+    }
 
 
 def format_results_text(validation_data: dict, file_path: str) -> str:
@@ -602,30 +1113,18 @@ def format_results_text(validation_data: dict, file_path: str) -> str:
         output.append("No validation rules executed.")
         return "\n".join(output)
 
-    # Count issues, separating execution errors from validation findings
-    validation_issues = 0
-    execution_errors = 0
-    execution_error_rules = set()
+    # Nothing to count when the validation is known to be clean
+    if validation_data.get("has_errors") is False:
+        output.append("Validation PASSED - No issues found.")
+        return "\n".join(output)
 
-    for result in results:
-        rule_id = result.get("rule_id", "Unknown")
-        for r in result.get("results", []):
-            if isinstance(r, list):
-                for item in r:
-                    if isinstance(item, dict) and item.get("errors"):
-                        for error in item["errors"]:
-                            if _is_execution_error(error):
-                                execution_errors += 1
-                                execution_error_rules.add(rule_id)
-                            else:
-                                validation_issues += 1
-            elif isinstance(r, dict) and r.get("errors"):
-                for error in r["errors"]:
-                    if _is_execution_error(error):
-                        execution_errors += 1
-                        execution_error_rules.add(rule_id)
-                    else:
-                        validation_issues += 1
+    # Issues are counted by _run_validation, results built elsewhere are
+    # counted here
+    summary = validation_data.get("summary") or _summarise_results(results)
+    validation_issues = summary["validation_issues"]
+    execution_errors = summary["execution_errors"]
+    execution_error_rules = summary["execution_error_rules"]
+    findings = summary["findings"]
 
     if validation_issues == 0 and execution_errors == 0:
         output.append("Validation PASSED - No issues found.")
@@ -633,51 +1132,27 @@ def format_results_text(validation_data: dict, file_path: str) -> str:
 
     if validation_issues == 0:
         output.append("Validation PASSED - No data issues found.")
-        output.append(f"(Note: {execution_errors} rule execution errors from {len(execution_error_rules)} rules - these rules may not apply to all entity types)")
+        output.append(f"(Note: {execution_errors} rule execution errors from {execution_error_rules} rules - these rules may not apply to all entity types)")
         return "\n".join(output)
 
     output.append(f"Found {validation_issues} validation issue(s):")
     if execution_errors > 0:
-        output.append(f"(Plus {execution_errors} rule execution errors from {len(execution_error_rules)} rules)")
+        output.append(f"(Plus {execution_errors} rule execution errors from {execution_error_rules} rules)")
     output.append("-" * 60)
 
-    for result in results:
-        rule_id = result.get("rule_id", "Unknown")
+    for result, real_errors in findings:
         description = result.get("description", "")
         action_message = result.get("message", "")
-        for r in result.get("results", []):
-            if isinstance(r, list):
-                for item in r:
-                    if isinstance(item, dict):
-                        errors = item.get("errors", [])
-                        # Filter out execution errors
-                        real_errors = [e for e in errors if not _is_execution_error(e)]
-                        if real_errors:
-                            output.append(f"\nRule: {rule_id}")
-                            if description:
-                                output.append(f"Description: {description}")
-                            if action_message:
-                                output.append(f"Message: {action_message}")
-                            output.append(f"Errors ({len(real_errors)}):")
-                            for error in real_errors[:10]:
-                                output.append(f"  - {error}")
-                            if len(real_errors) > 10:
-                                output.append(f"  ... and {len(real_errors) - 10} more")
-            elif isinstance(r, dict):
-                errors = r.get("errors", [])
-                # Filter out execution errors
-                real_errors = [e for e in errors if not _is_execution_error(e)]
-                if real_errors:
-                    output.append(f"\nRule: {rule_id}")
-                    if description:
-                        output.append(f"Description: {description}")
-                    if action_message:
-                        output.append(f"Message: {action_message}")
-                    output.append(f"Errors ({len(real_errors)}):")
-                    for error in real_errors[:10]:
-                        output.append(f"  - {error}")
-                    if len(real_errors) > 10:
-                        output.append(f"  ... and {len(real_errors) - 10} more")
+        output.append(f"\nRule: {result.get('rule_id', 'Unknown')}")
+        if description:
+            output.append(f"Description: {description}")
+        if action_message:
+            output.append(f"Message: {action_message}")
+        output.append(f"Errors ({len(real_errors)}):")
+        for error in real_errors[:10]:
+            output.append(f"  - {error}")
+        if len(real_errors) > 10:
+            output.append(f"  ... and {len(real_errors) - 10} more")
 
     output.append("")
     output.append("=" * 60)
@@ -685,6 +1160,19 @@ def format_results_text(validation_data: dict, file_path: str) -> str:
     return "\n".join(output)
 
 
+def _json_report(validation_data: dict, file_path: str) -> dict:
+    """Return the JSON report of a file's validation results."""
+    results = validation_data.get("results", [])
+    return {
+        "file": file_path,
+        "rules_executed": len(results),
+        "ct_packages_available": validation_data.get("ct_packages_count", 0),
+        "ct_packages_loaded": validation_data.get("ct_packages_loaded", []),
+        "ct_packages": validation_data.get("ct_packages", []),
+        "results": results
+    }
+
+
 def format_results_json(validation_data: dict, file_path: str) -> str:
     """
     Format validation results as JSON.
@@ -696,21 +1184,61 @@ def format_results_json(validation_data: dict, file_path: str) -> str:
     Returns:
         JSON string
     """
-    results = validation_data.get("results", [])
-    output_data = {
-        "file": file_path,
-        "rules_executed": len(results),
-        "ct_packages_available": validation_data.get("ct_packages_count", 0),
-        "ct_packages_loaded": validation_data.get("ct_packages_loaded", []),
-        "ct_packages": validation_data.get("ct_packages", []),
-        "results": results
-    }
+    return _dumps_report(_json_report(validation_data, file_path)).decode("utf-8")
+
 
-    return json.dumps(output_data, indent=2, default=str)
+def format_batch_results_json(validations: list, file_paths: list) -> str:
+    """
+    Format the validation results of several files as a JSON list.
+
+    Args:
+        validations: Dicts with results and metadata from validate_usdm_files()
+        file_paths: The paths to the validated files, in the same order
+
+    Returns:
+        JSON string
+    """
+    return _dumps_batch_report(validations, file_paths).decode("utf-8")
+
+
+def _dumps_batch_report(validations: list, file_paths: list) -> bytes:
+    """Serialise the JSON reports of several files as a list, to UTF-8."""
+    return _dumps_report(
+        [
+            _json_report(validation_data, file_path)
+            for validation_data, file_path in zip(validations, file_paths)
+        ]
+    )
+
+
+def _dumps_report(output_data) -> bytes:
+    """
+    Serialise a JSON report, indented, to UTF-8.
+
+    Numpy values in the engine's results are written as JSON numbers and
+    lists, anything else that JSON does not know as its string.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            output_data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            default=str,
+        )
+    return json.dumps(output_data, indent=2, default=_json_default).encode("utf-8")
+
+
+def _json_default(value):
+    """Convert a value json cannot serialise, numpy values have tolist()."""
+    tolist = getattr(value, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    return str(value)
 
 
 def main():
     """Main entry point for the USDM validation utility."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Validate USDM JSON files using CDISC Rules Engine (CORE)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -720,6 +1248,7 @@ Examples:
     python usdm_validate.py study.json -v 4-0
     python usdm_validate.py study.json -o results.json -f json
     python usdm_validate.py study.json --verbose
+    python usdm_validate.py study1.json study2.json -f json
 
 Note: Requires CDISC_API_KEY or CDISC_LIBRARY_API_KEY environment variable
 to be set for accessing CDISC Library rules.
@@ -728,7 +1257,8 @@ to be set for accessing CDISC Library rules.
 
     parser.add_argument(
         "usdm_file",
-        help="Path to the USDM JSON file to validate"
+        nargs="+",
+        help="Path to the USDM JSON file(s) to validate"
     )
 
     parser.add_argument(
@@ -751,6 +1281,13 @@ to be set for accessing CDISC Library rules.
         help="Output format (default: text)"
     )
 
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes validating rules, 0 for one per CPU (default: 1)"
+    )
+
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -765,45 +1302,50 @@ to be set for accessing CDISC Library rules.
         print("Set CDISC_API_KEY or CDISC_LIBRARY_API_KEY for full validation.", file=sys.stderr)
 
     try:
-        # Validate the USDM file
-        validation_data = validate_usdm(
+        # Validate the USDM files, the engine set up is shared by all of them
+        validations = validate_usdm_files(
             args.usdm_file,
             version=args.version,
-            verbose=args.verbose
+            verbose=args.verbose,
+            jobs=args.jobs
         )
 
-        # Format the results
+        # Format the results, JSON is kept as the UTF-8 bytes it is
+        # serialised to and written without decoding it again
         if args.format == "json":
-            output = format_results_json(validation_data, args.usdm_file)
+            # Kept as bytes, the formatters decode only to return a str
+            if len(validations) > 1:
+                output = _dumps_batch_report(validations, args.usdm_file)
+            else:
+                output = _dumps_report(_json_report(validations[0], args.usdm_file[0]))
+        elif len(validations) > 1:
+            output = "\n\n".join(
+                format_results_text(validation_data, file_path)
+                for validation_data, file_path in zip(validations, args.usdm_file)
+            )
         else:
-            output = format_results_text(validation_data, args.usdm_file)
+            output = format_results_text(validations[0], args.usdm_file[0])
 
         # Write output
         if args.output:
-            with open(args.output, "w", encoding="utf-8") as f:
-                f.write(output)
+            if isinstance(output, bytes):
+                with open(args.output, "wb") as f:
+                    f.write(output)
+            else:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    f.write(output)
             if args.verbose:
                 print(f"Results written to: {args.output}")
+        elif isinstance(output, bytes):
+            # Anything printed before goes out first
+            sys.stdout.flush()
+            sys.stdout.buffer.write(output)
+            sys.stdout.buffer.write(b"\n")
         else:
             print(output)
 
         # Return exit code based on results
-        has_errors = False
-        results_list = validation_data.get("results", [])
-        for result in results_list:
-            for r in result.get("results", []):
-                if isinstance(r, list):
-                    for item in r:
-                        if isinstance(item, dict) and item.get("errors"):
-                            has_errors = True
-                            break
-                elif isinstance(r, dict) and r.get("errors"):
-                    has_errors = True
-                    break
-            if has_errors:
-                break
-
-        sys.exit(1 if has_errors else 0)
+        sys.exit(1 if any(v["has_errors"] for v in validations) else 0)
 
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)